@@ -0,0 +1,262 @@
+import numpy as np
+
+import constants as c
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # Kernels run as plain Python; see simulate_triples_numpy
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+# Relation ordinals follow constants.ALLEN_RELATIONS
+BEFORE = c.REL_INDEX[c.BEFORE]
+MEETS = c.REL_INDEX[c.MEETS]
+OVERLAPS = c.REL_INDEX[c.OVERLAPS]
+FINISHED_BY = c.REL_INDEX[c.FINISHED_BY]
+CONTAINS = c.REL_INDEX[c.CONTAINS]
+STARTS = c.REL_INDEX[c.STARTS]
+EQUALS = c.REL_INDEX[c.EQUALS]
+STARTED_BY = c.REL_INDEX[c.STARTED_BY]
+DURING = c.REL_INDEX[c.DURING]
+FINISHES = c.REL_INDEX[c.FINISHES]
+OVERLAPPED_BY = c.REL_INDEX[c.OVERLAPPED_BY]
+MET_BY = c.REL_INDEX[c.MET_BY]
+AFTER = c.REL_INDEX[c.AFTER]
+N_RELATIONS = len(c.ALLEN_RELATIONS)
+
+
+@njit(cache=True)
+def relation_index(a_start, a_end, b_start, b_end):
+    # Same decision order as intervals.get_relation, returning an ordinal
+    if a_end < b_start:
+        return BEFORE
+    if a_end == b_start:
+        return MEETS
+    if b_end < a_start:
+        return AFTER
+    if b_end == a_start:
+        return MET_BY
+    if a_start == b_start and a_end == b_end:
+        return EQUALS
+    if a_start == b_start:
+        return STARTS if a_end < b_end else STARTED_BY
+    if a_end == b_end:
+        return FINISHED_BY if a_start < b_start else FINISHES
+    if a_start < b_start and a_end > b_end:
+        return CONTAINS
+    if a_start > b_start and a_end < b_end:
+        return DURING
+    if a_start < b_start:
+        return OVERLAPS
+    return OVERLAPPED_BY
+
+
+# Waits run to about 37 / p steps; below this floor endpoints could pass
+# 2**53, where float steps stop being exact integers and ties are lost
+MIN_PROBABILITY = 1e-12
+
+
+@njit(cache=True)
+def check_reachable(p_born, p_die):
+    # With either probability at zero no interval ever dies, so a trial
+    # would never reach the all-dead state
+    if p_born <= 0.0 or p_die <= 0.0:
+        raise ValueError("pBorn and pDie must be positive for intervals to end")
+    if p_born < MIN_PROBABILITY or p_die < MIN_PROBABILITY:
+        raise ValueError("pBorn and pDie must be at least 1e-12")
+
+
+@njit(cache=True)
+def geometric(u, p):
+    # Steps until the first toss below p, from one uniform u in (0, 1]
+    if p >= 1.0:
+        return 1
+    return int(np.floor(np.log(u) / np.log1p(-p))) + 1
+
+
+@njit(cache=True)
+def draw_uniforms(n, k, seed):
+    # An (n, k) block of uniforms in (0, 1], continuing the stream when seed
+    # is negative. Kept out of the parallel kernels: under parallel=True the
+    # draw would be split over per-thread generators the seed never reaches.
+    if seed >= 0:
+        np.random.seed(seed)
+    return 1.0 - np.random.random((n, k))
+
+
+@njit(cache=True, parallel=True)
+def pair_counts(p1, q1, p2, q2, trials, seed):
+    # Relation tally for intervals a ~ (p1, q1) and b ~ (p2, q2)
+    check_reachable(p1, q1)
+    check_reachable(p2, q2)
+    # Four draws per trial: birth and death step for each interval.
+    # One toss per step, as in simulations.updateState, so an interval
+    # can never be born and die on the same step. They are drawn serially
+    # and the trials classified in parallel, so the tally does not depend
+    # on how prange splits them.
+    u = draw_uniforms(trials, 4, seed)
+    rels = np.empty(trials, dtype=np.int64)
+    for t in prange(trials):
+        a_start = geometric(u[t, 0], p1)
+        a_end = a_start + geometric(u[t, 1], q1)
+        b_start = geometric(u[t, 2], p2)
+        b_end = b_start + geometric(u[t, 3], q2)
+        rels[t] = relation_index(a_start, a_end, b_start, b_end)
+    return np.bincount(rels, minlength=N_RELATIONS)
+
+
+@njit(cache=True)
+def ar_simulate_batch(p_born, p_die, trials, seed):
+    # seed < 0 leaves the generator unseeded; one stream serves every cell
+    if seed >= 0:
+        np.random.seed(seed)
+    counts = np.zeros((p_born.shape[0], N_RELATIONS), dtype=np.int64)
+    for g in range(p_born.shape[0]):
+        counts[g] = pair_counts(p_born[g], p_die[g], p_born[g], p_die[g], trials, -1)
+    return counts
+
+
+@njit(cache=True, parallel=True)
+def simulate_triples(p_born, p_die, out, seed):
+    # Fills each (r12, r23, r13) row of `out` with ALLEN_RELATIONS ordinals.
+    # A negative seed continues the current random stream, so a run can be
+    # split over slices of one preallocated array.
+    check_reachable(p_born, p_die)
+    # Six draws per trial, a birth and death wait for each interval, so the
+    # cost of a trial does not grow with its length. They are drawn serially,
+    # so the rows do not depend on how prange splits the trials.
+    u = draw_uniforms(out.shape[0], 6, seed)
+    for t in prange(out.shape[0]):
+        a_start = geometric(u[t, 0], p_born)
+        a_end = a_start + geometric(u[t, 1], p_die)
+        b_start = geometric(u[t, 2], p_born)
+        b_end = b_start + geometric(u[t, 3], p_die)
+        d_start = geometric(u[t, 4], p_born)
+        d_end = d_start + geometric(u[t, 5], p_die)
+        out[t, 0] = relation_index(a_start, a_end, b_start, b_end)
+        out[t, 1] = relation_index(b_start, b_end, d_start, d_end)
+        out[t, 2] = relation_index(a_start, a_end, d_start, d_end)
+
+
+# Trials per NumPy batch, bounding the temporary arrays to a few MB
+BATCH_TRIALS = 1 << 16
+
+# Like numba's np.random state, one generator persists across calls
+_rng = np.random.default_rng()
+
+
+def numpy_stream(seed):
+    # The shared generator, restarted first when seed is non-negative
+    global _rng
+    if seed >= 0:
+        _rng = np.random.default_rng(seed)
+    return _rng
+
+
+def sign_code(a_start, a_end, b_start, b_end):
+    # The signs of the four start/end comparisons packed into 0..80; these
+    # decide the relation between two proper intervals
+    return (
+        27 * np.sign(a_start - b_start)
+        + 9 * np.sign(a_end - b_end)
+        + 3 * np.sign(a_start - b_end)
+        + np.sign(a_end - b_start)
+        + 40
+    )
+
+
+def relation_table():
+    # Relation ordinal for each sign code, read off relation_index itself
+    classify = getattr(relation_index, "py_func", relation_index)
+    table = np.zeros(81, dtype=np.int8)
+    for a_start, a_end, b_start, b_end in np.ndindex(4, 4, 4, 4):
+        if a_start < a_end and b_start < b_end:
+            code = sign_code(a_start, a_end, b_start, b_end)
+            table[code] = classify(a_start, a_end, b_start, b_end)
+    return table
+
+
+RELATION_TABLE = relation_table()
+
+
+def relation_indices(a_start, a_end, b_start, b_end):
+    # Vectorised relation_index over arrays of endpoints, as one table lookup
+    return RELATION_TABLE[sign_code(a_start, a_end, b_start, b_end)]
+
+
+def simulate_triples_numpy(p_born, p_die, out, seed):
+    # Same output as simulate_triples, in batches of whole-array operations.
+    # Each interval's birth and death waits are geometric in the number of
+    # updateState tosses, so they are drawn directly rather than stepped.
+    check_reachable(p_born, p_die)
+    rng = numpy_stream(seed)
+    n = out.shape[0]
+    for lo in range(0, n, BATCH_TRIALS):
+        size = (min(BATCH_TRIALS, n - lo), 3)
+        starts = rng.geometric(p_born, size)
+        ends = starts + rng.geometric(p_die, size)
+        a_start, b_start, d_start = starts.T
+        a_end, b_end, d_end = ends.T
+        out[lo : lo + size[0], 0] = relation_indices(a_start, a_end, b_start, b_end)
+        out[lo : lo + size[0], 1] = relation_indices(b_start, b_end, d_start, d_end)
+        out[lo : lo + size[0], 2] = relation_indices(a_start, a_end, d_start, d_end)
+
+
+def pair_counts_numpy(p1, q1, p2, q2, trials, seed):
+    # Same output as pair_counts, drawn and classified in batches
+    check_reachable(p1, q1)
+    check_reachable(p2, q2)
+    rng = numpy_stream(seed)
+    counts = np.zeros(N_RELATIONS, dtype=np.int64)
+    for lo in range(0, trials, BATCH_TRIALS):
+        n = min(BATCH_TRIALS, trials - lo)
+        a_start = rng.geometric(p1, n)
+        a_end = a_start + rng.geometric(q1, n)
+        b_start = rng.geometric(p2, n)
+        b_end = b_start + rng.geometric(q2, n)
+        rels = relation_indices(a_start, a_end, b_start, b_end)
+        counts += np.bincount(rels, minlength=N_RELATIONS)
+    return counts
+
+
+def ar_simulate_batch_numpy(p_born, p_die, trials, seed):
+    # Same output as ar_simulate_batch, drawn and classified in batches
+    rng = numpy_stream(seed)
+    counts = np.zeros((p_born.shape[0], N_RELATIONS), dtype=np.int64)
+    for g in range(p_born.shape[0]):
+        check_reachable(p_born[g], p_die[g])
+        for lo in range(0, trials, BATCH_TRIALS):
+            size = (min(BATCH_TRIALS, trials - lo), 2)
+            starts = rng.geometric(p_born[g], size)
+            ends = starts + rng.geometric(p_die[g], size)
+            rels = relation_indices(starts[:, 0], ends[:, 0], starts[:, 1], ends[:, 1])
+            counts[g] += np.bincount(rels, minlength=N_RELATIONS)
+    return counts
+
+
+if not HAVE_NUMBA:
+    simulate_triples = simulate_triples_numpy
+    pair_counts = pair_counts_numpy
+    ar_simulate_batch = ar_simulate_batch_numpy
+
+
+# Build the ahead-of-time extension: python _simcc.py
+if __name__ == "__main__":
+    from numba.pycc import CC
+
+    cc = CC("allen_sim")
+    # The extension cannot link numba's thread pool, so ar_simulate_batch is
+    # built against a serial copy of pair_counts
+    pair_counts = njit(pair_counts.py_func)
+    cc.export("ar_simulate_batch", "i8[:,:](f8[:], f8[:], i8, i8)")(
+        ar_simulate_batch.py_func
+    )
+    # Built without parallel=True, so its prange runs as a serial loop
+    cc.export("simulate_triples", "void(f8, f8, i1[:,:], i8)")(simulate_triples.py_func)
+    cc.compile()
@@ -1,5 +1,5 @@
 import dash
-from dash import dcc, html, callback, Input, Output, State, dash_table
+from dash import dcc, html, callback, Input, Output, State, Patch, dash_table
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import plotly.express as px
@@ -10,49 +10,81 @@ import math
 from plotly.subplots import make_subplots
 from datetime import datetime
 import plotly.io as pio
+from flask.json.provider import DefaultJSONProvider
 import base64
 from io import BytesIO
 from fractions import Fraction
+from functools import lru_cache
 import os
 import io
 import re
 
 # Import required functions and constants
 from simulations import arSimulate
-from stats import entropy, gini, describe_global, js_divergence
+from stats import entropy, entropy_matrix, gini, describe_global, js_divergence
 from constants import (
     ALLEN_RELATIONS,
-    UNIFORM_DISTRIBUTION,
-    FERNANDO_VOGEL_DISTRIBUTION,
-    SULIMAN_DISTRIBUTION,
+    UNIFORM_PMF,
+    FERNANDO_VOGEL_PMF,
+    SULIMAN_PMF,
+    distribution_pmf,
     RELATION_NAMES,
     RELATION_COLORS,
+    RELATION_NAME_TABLE,
+    RELATION_COLOR_TABLE,
+    REL_INDEX,
+    ALL_RELATIONS_MASK,
+)
+from comp_runner import (
+    generate_valid_triples,
+    build_composition_table,
+    composition_counts,
 )
-from comp_runner import generate_valid_triples, build_composition_table
 from reference_tables import get_reference_tables
+from relations import rel_mask, mask_rels
+from formatting import format_number
+
+# Optional fast JSON parser for callback requests (see OrjsonProvider)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Long simulations run as background callbacks in a worker process when
+# diskcache is installed (dash[diskcache]), so the server stays free for the
+# rest of the UI; without it they run in the request as before
+try:
+    import diskcache
+
+    background_callback_manager = dash.DiskcacheManager(diskcache.Cache("./.cache"))
+    composition_cache = diskcache.Cache("./.cache/compositions")
+except ImportError:
+    background_callback_manager = None
+    composition_cache = None
 
 # Initialize the Dash app with Bootstrap styling
 app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager,
 )
 
 # Add this line to expose the Flask server for Gunicorn
 server = app.server
 
 
-# Helper function for number formatting
-def format_number(val, digits=4):
-    if val is None:
-        return "N/A"
-    if isinstance(val, float):
-        if math.isnan(val):
-            return "NaN"
-        if math.isinf(val):
-            return "∞" if val > 0 else "-∞"
-        return f"{val:.{digits}f}"
-    return str(val)
+# Callback requests carry whole stores back to the server; Dash encodes its
+# responses with orjson when installed, so request bodies are parsed with it
+# too. The browser's JSON.stringify never emits the NaN/Infinity tokens that
+# only the json module accepts.
+class OrjsonProvider(DefaultJSONProvider):
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    server.json = OrjsonProvider(server)
 
 
 # Calculate standard deviation of distribution
@@ -72,11 +104,169 @@ def find_mode(distribution):
     return None
 
 
-# Convert a percentage to a simplified fraction representation
+# Relation probabilities of a simulation-results store. Runs store only their
+# integer counts; uploaded results keep the distribution they were given.
+def results_distribution(results):
+    if "distribution" in results:
+        return results["distribution"]
+    counts = results.get("raw_counts", {})
+    total = sum(counts.values())
+    return {key: value / total if total > 0 else 0 for key, value in counts.items()}
+
+
+# Relation ordinals in display order, sorted by probability if requested; the
+# stable sort keeps ties in ALLEN_RELATIONS order
+def display_order(probs, sort_by):
+    if "sort" in sort_by:
+        return np.argsort(-probs, kind="stable")
+    return np.arange(len(probs))
+
+
+# Dense (r1, r2, r3) counts from a matrix store, indexed by relation ordinal
+def matrix_counts(matrix):
+    counts = np.zeros((len(ALLEN_RELATIONS),) * 3, dtype=np.int64)
+    for i, r1 in enumerate(ALLEN_RELATIONS):
+        for j, r2 in enumerate(ALLEN_RELATIONS):
+            cell = matrix.get(r1, {}).get(r2, {})
+            for rel, data in cell.get("composition", {}).items():
+                counts[i, j, REL_INDEX[rel]] = data["count"]
+    return counts
+
+
+# Shared component styles. Dash only reads these dicts, so one instance
+# serves every component and callback that uses it.
+# Number field beside a slider, matching the slider's height
+NUMBER_INPUT_STYLE = {"height": "38px"}
+# Dashed drop zone of the JSON upload boxes
+UPLOAD_STYLE = {
+    "width": "100%",
+    "height": "60px",
+    "lineHeight": "60px",
+    "borderWidth": "1px",
+    "borderStyle": "dashed",
+    "borderRadius": "5px",
+    "textAlign": "center",
+    "margin-bottom": "10px",
+}
+# Right-aligned label column of the summary tables
+LABEL_CELL_STYLE = {"paddingRight": "10px", "textAlign": "right"}
+
+# Slider marks and tooltip, shared the same way: probability sliders are
+# marked every 0.1, max-denominator sliders every 10
+PROBABILITY_MARKS = {i / 10: f"{i/10:.1f}" for i in range(11)}
+DENOMINATOR_MARKS = {i: str(i) for i in range(10, 101, 10)}
+SLIDER_TOOLTIP = {"placement": "bottom", "always_visible": True}
+
+
+# metrics-history keys plotted by the metrics chart, in trace order
+METRICS_TRACES = ["entropy", "js_uniform", "js_fv", "js_suliman", "gini"]
+
+
+def metrics_hover_text(history, i):
+    # Hover label for run i of a metrics history
+    return f"Run {i+1}<br>{history['params'][i]}<br>{history['timestamps'][i]}"
+
+
+# Full metrics-over-runs chart for a metrics history
+def create_metrics_figure(metrics_history):
+    metrics_fig = make_subplots(specs=[[{"secondary_y": True}]])
+    metrics_fig.add_trace(
+        go.Scatter(
+            x=metrics_history["runs"],
+            y=metrics_history["entropy"],
+            mode="lines+markers",
+            name="Entropy",
+            line=dict(color="blue", width=2),
+        ),
+        secondary_y=False,
+    )
+    metrics_fig.add_trace(
+        go.Scatter(
+            x=metrics_history["runs"],
+            y=metrics_history["js_uniform"],
+            mode="lines+markers",
+            name="JS (Uniform)",
+            line=dict(color="green", width=2, dash="dot"),
+            marker=dict(size=6),
+        ),
+        secondary_y=False,
+    )
+    metrics_fig.add_trace(
+        go.Scatter(
+            x=metrics_history["runs"],
+            y=metrics_history["js_fv"],
+            mode="lines+markers",
+            name="JS (F-V)",
+            line=dict(color="purple", width=2, dash="dashdot"),
+            marker=dict(size=6),
+        ),
+        secondary_y=False,
+    )
+    metrics_fig.add_trace(
+        go.Scatter(
+            x=metrics_history["runs"],
+            y=metrics_history["js_suliman"],
+            mode="lines+markers",
+            name="JS (Suliman)",
+            line=dict(color="orange", width=2, dash="dot"),
+            marker=dict(size=6),
+        ),
+        secondary_y=False,
+    )
+    metrics_fig.add_trace(
+        go.Scatter(
+            x=metrics_history["runs"],
+            y=metrics_history["gini"],
+            mode="lines+markers",
+            name="Gini Coefficient",
+            line=dict(color="red", width=2),
+        ),
+        secondary_y=True,
+    )
+    hover_texts = [
+        metrics_hover_text(metrics_history, i)
+        for i in range(len(metrics_history["params"]))
+    ]
+    for trace in metrics_fig.data:
+        trace.hovertext = hover_texts
+        trace.hovertemplate = "%{hovertext}<br>%{y:.4f}<extra></extra>"
+    metrics_fig.update_layout(
+        title="Metrics Over Simulation Runs",
+        xaxis_title="Run Number",
+        template="plotly_white",
+        transition_duration=500,
+        hovermode="closest",
+        height=400,
+    )
+    metrics_fig.update_yaxes(title_text="Entropy / JS Divergence", secondary_y=False)
+    metrics_fig.update_yaxes(title_text="Gini Coefficient", secondary_y=True)
+    return metrics_fig
+
+
+# Patch appending the latest run of a metrics history to its chart
+def extend_metrics_figure(metrics_history):
+    last = len(metrics_history["runs"]) - 1
+    hover_text = metrics_hover_text(metrics_history, last)
+    patched = Patch()
+    for k, key in enumerate(METRICS_TRACES):
+        # Child patches share the parent's operations, so one per trace serves
+        trace = patched["data"][k]
+        trace["x"].append(metrics_history["runs"][last])
+        trace["y"].append(metrics_history[key][last])
+        trace["hovertext"].append(hover_text)
+    return patched
+
+
+# Convert a percentage to a simplified fraction representation. Tables are
+# re-rendered with the same values on every sort, model or denominator
+# toggle, so results are cached rather than re-approximated
+@lru_cache(maxsize=4096)
 def percentage_to_fraction(percentage, max_denominator=30):
     """Convert a percentage to a simplified fraction representation."""
-    if percentage == 100:
+    if math.isclose(percentage, 100.0, abs_tol=1e-9):
         return "-"  # Use dash for 100% (single outcome)
+    if percentage <= 0:
+        return "0"
 
     decimal = percentage / 100
     frac = Fraction(decimal).limit_denominator(max_denominator)
@@ -85,42 +275,81 @@ def percentage_to_fraction(percentage, max_denominator=30):
     return f"{frac.numerator}/{frac.denominator}"
 
 
+# Composition table of one simulation and its number of valid triples. The
+# composition tab reads one cell of it and the matrix tab all of them, so a
+# new relation pair, a repeat click or the other tab with the same parameters
+# reuses the table instead of simulating it again
+def cached_composition_table(p_born, p_die, trials, limit):
+    triples = generate_valid_triples(p_born, p_die, trials, limit)
+    return build_composition_table(triples), len(triples)
+
+
+# With diskcache the tables are kept on disk, so gunicorn workers and
+# background jobs share them and they survive a restart. The version in the
+# name keys out tables from an older simulation; bump it when that changes
+if composition_cache is not None:
+    cached_composition_table = composition_cache.memoize(
+        name="composition_table.v1", expire=7 * 24 * 3600
+    )(cached_composition_table)
+else:
+    cached_composition_table = lru_cache(maxsize=32)(cached_composition_table)
+
+
+def simulate_composition_table(p_born, p_die, trials, limit):
+    # Probabilities are rounded for the key, so a slider value carrying float
+    # noise (0.30000000000000004) and the same value typed in share an entry
+    table, valid_count = cached_composition_table(
+        round(p_born, 6), round(p_die, 6), trials, limit
+    )
+    table.flags.writeable = False
+    return table, valid_count
+
+
 # Function to generate all 13×13 compositions
 def generate_full_composition_matrix(p_born, p_die, trials, limit_per_cell):
     """Generate a full 13×13 composition matrix for all Allen relations"""
-    # First generate the triples with the simulation parameters
-    triples = generate_valid_triples(p_born, p_die, trials, limit_per_cell)
-
-    # Build the composition table from the generated triples
-    table = build_composition_table(triples)
+    table, valid_count = simulate_composition_table(
+        p_born, p_die, trials, limit_per_cell
+    )
 
     # Initialize the results matrix
     matrix = {}
 
-    # Track global distribution of R3 outcomes across all compositions
-    global_r3_counts = {}
+    # Cell totals and the global distribution of R3 outcomes across all
+    # compositions, reduced straight from the dense table
+    totals = table.sum(axis=2)
+    global_r3_counts = {
+        ALLEN_RELATIONS[k]: int(count)
+        for k, count in enumerate(table.sum(axis=(0, 1)))
+        if count > 0
+    }
+
+    # Every cell's percentages in one masked divide over the table
+    percentages = (
+        np.divide(
+            table,
+            totals[:, :, None],
+            out=np.zeros(table.shape),
+            where=totals[:, :, None] > 0,
+        )
+        * 100
+    )
 
     # For each pair of relations, extract the composition results
-    for r1 in ALLEN_RELATIONS:
+    for i, r1 in enumerate(ALLEN_RELATIONS):
         matrix[r1] = {}
-        for r2 in ALLEN_RELATIONS:
-            composition = table.get(r1, {}).get(r2, {})
-            if composition:
-                total = sum(composition.values())
+        for j, r2 in enumerate(ALLEN_RELATIONS):
+            if totals[i, j] > 0:
                 matrix[r1][r2] = {
                     "composition": {
-                        rel: {
-                            "count": count,
-                            "percentage": (count / total * 100) if total > 0 else 0,
+                        ALLEN_RELATIONS[k]: {
+                            "count": int(table[i, j, k]),
+                            "percentage": float(percentages[i, j, k]),
                         }
-                        for rel, count in composition.items()
+                        for k in np.flatnonzero(table[i, j])
                     },
-                    "total": total,
+                    "total": int(totals[i, j]),
                 }
-
-                # Add to global distribution counts
-                for rel, count in composition.items():
-                    global_r3_counts[rel] = global_r3_counts.get(rel, 0) + count
             else:
                 matrix[r1][r2] = {"composition": {}, "total": 0}
 
@@ -138,9 +367,9 @@ def generate_full_composition_matrix(p_born, p_die, trials, limit_per_cell):
     global_coverage = sum(1 for val in global_distribution.values() if val > 0)
 
     # Calculate JS divergence against theoretical models
-    js_uniform = js_divergence(global_distribution, UNIFORM_DISTRIBUTION)
-    js_fv = js_divergence(global_distribution, FERNANDO_VOGEL_DISTRIBUTION)
-    js_suliman = js_divergence(global_distribution, SULIMAN_DISTRIBUTION)
+    js_uniform = js_divergence(global_distribution, UNIFORM_PMF)
+    js_fv = js_divergence(global_distribution, FERNANDO_VOGEL_PMF)
+    js_suliman = js_divergence(global_distribution, SULIMAN_PMF)
 
     # Determine best fit model
     min_js = min(js_uniform, js_fv, js_suliman)
@@ -178,1197 +407,799 @@ def generate_full_composition_matrix(p_born, p_die, trials, limit_per_cell):
         ),
     }
 
-    return matrix, len(triples), global_stats
+    return matrix, valid_count, global_stats
 
 
-# Create the layout with a more compact header and improved styling with proper edge alignment
-app.layout = dbc.Container(
-    [
-        # Redesigned compact header section with properly aligned right edges
-        dbc.Row(
-            [
-                # Left side - Title
-                dbc.Col(
-                    html.H2(
-                        "Probabilities of Allen Interval Relations", className="mt-3"
-                    ),
-                    md=5,
-                ),
-                # Right side - With consistent right alignment that matches other containers
-                dbc.Col(
-                    [
-                        # Badges with better spacing and alignment
-                        html.Div(
-                            [
-                                html.A(
-                                    html.Img(
-                                        src="https://img.shields.io/badge/License-MIT-yellow.svg",
-                                        alt="MIT License",
+# The composition and matrix tabs are built on first activation (see
+# build_lazy_tab), so a page load only mounts the simulator tab
+def composition_tab_body():
+    # Composition Analysis tab - Now only contains single composition analysis
+    return dbc.Row(
+        [
+            dbc.Col(
+                [
+                    # Parameters Card
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Simulation Parameters"),
+                            dbc.CardBody(
+                                [
+                                    # Birth probability with slider and precise input field
+                                    html.Label("Birth Probability (pBorn):"),
+                                    dbc.Row(
+                                        [
+                                            dbc.Col(
+                                                dcc.Slider(
+                                                    id="comp-p-born-slider",
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.05,
+                                                    value=0.5,
+                                                    marks=PROBABILITY_MARKS,
+                                                    tooltip=SLIDER_TOOLTIP,
+                                                ),
+                                                width=9,
+                                            ),
+                                            dbc.Col(
+                                                dbc.Input(
+                                                    id="comp-p-born-input",
+                                                    type="number",
+                                                    value=0.5,
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.0001,  # Changed from 0.1 to 0.001
+                                                    style=NUMBER_INPUT_STYLE,
+                                                ),
+                                                width=3,
+                                            ),
+                                        ],
+                                        className="mb-3 align-items-center",
                                     ),
-                                    href="https://github.com/vxrdis/allen-interval-probabilities/blob/main/LICENSE",
-                                    className="d-inline-block mx-2",
-                                    style={"textDecoration": "none"},
-                                ),
-                                html.A(
-                                    html.Img(
-                                        src="https://img.shields.io/badge/Python-3.9-blue.svg",
-                                        alt="Python 3.9",
+                                    # Death probability with slider and precise input field
+                                    html.Label("Death Probability (pDie):"),
+                                    dbc.Row(
+                                        [
+                                            dbc.Col(
+                                                dcc.Slider(
+                                                    id="comp-p-die-slider",
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.05,
+                                                    value=0.5,
+                                                    marks=PROBABILITY_MARKS,
+                                                    tooltip=SLIDER_TOOLTIP,
+                                                ),
+                                                width=9,
+                                            ),
+                                            dbc.Col(
+                                                dbc.Input(
+                                                    id="comp-p-die-input",
+                                                    type="number",
+                                                    value=0.5,
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.0001,  # Changed from 0.1 to 0.001
+                                                    style=NUMBER_INPUT_STYLE,
+                                                ),
+                                                width=3,
+                                            ),
+                                        ],
+                                        className="mb-3 align-items-center",
                                     ),
-                                    href="https://www.python.org/downloads/release/python-396/",
-                                    className="d-inline-block mx-2",
-                                    style={"textDecoration": "none"},
-                                ),
-                                html.A(
-                                    html.Img(
-                                        src="https://img.shields.io/github/last-commit/vxrdis/allen-interval-probabilities",
-                                        alt="Last Commit",
+                                    # Small helper text for precise value input
+                                    html.Small(
+                                        "Use input fields for precise values (e.g. 0.001)",
+                                        className="text-muted d-block mb-3",
                                     ),
-                                    href="https://github.com/vxrdis/allen-interval-probabilities/commits/main",
-                                    className="d-inline-block mx-2",
-                                    style={"textDecoration": "none"},
-                                ),
-                                html.A(
-                                    html.Img(
-                                        src="https://img.shields.io/github/repo-size/vxrdis/allen-interval-probabilities",
-                                        alt="Repo Size",
+                                    html.Label("Number of Trials:"),
+                                    dbc.Input(
+                                        id="comp-trials-input",
+                                        type="number",
+                                        min=1000,
+                                        step=1000,
+                                        value=100000,
+                                        className="mb-3",
                                     ),
-                                    href="https://github.com/vxrdis/allen-interval-probabilities",
-                                    className="d-inline-block mx-2",
-                                    style={"textDecoration": "none"},
-                                ),
-                                html.A(
-                                    html.Img(
-                                        src="https://img.shields.io/badge/code%20style-black-000000.svg",
-                                        alt="Code Style: Black",
+                                    html.Label("Results Limit:"),
+                                    dbc.Input(
+                                        id="comp-limit-input",
+                                        type="number",
+                                        min=100,
+                                        step=100,
+                                        value=100000,
+                                        className="mb-4",
                                     ),
-                                    href="https://black.readthedocs.io/en/stable/",
-                                    className="d-inline-block mx-2",
-                                    style={"textDecoration": "none"},
-                                ),
-                            ],
-                            # Remove horizontal padding/margin on the right side
-                            className="d-flex justify-content-end flex-wrap mb-2 pr-0",
-                            style={"paddingRight": "0", "marginRight": "0"},
-                        ),
-                        # Project info with improved alignment
-                        html.Div(
-                            [
-                                html.Small(
-                                    [
-                                        "A ",
-                                        html.A(
-                                            "Final Year Project",
-                                            href="https://projects.scss.tcd.ie",
-                                            target="_blank",
-                                            rel="noopener noreferrer",
-                                            className="text-decoration-none",
-                                            style={
-                                                "color": "#007bff",
-                                                "fontWeight": "500",
-                                            },
-                                        ),
-                                        " by ",
-                                        html.Strong("Cillín Forrester"),
-                                        " under supervision of Dr ",
-                                        html.A(
-                                            "Tim Fernando",
-                                            href="https://www.scss.tcd.ie/Tim.Fernando/",
-                                            target="_blank",
-                                            rel="noopener noreferrer",
-                                            className="text-decoration-none",
-                                            style={
-                                                "color": "#007bff",
-                                                "fontWeight": "500",
-                                            },
-                                        ),
-                                        ", ",
-                                        html.A(
-                                            "School of Computer Science and Statistics",
-                                            href="https://www.tcd.ie/scss/",
-                                            target="_blank",
-                                            rel="noopener noreferrer",
-                                            className="text-decoration-none",
-                                            style={
-                                                "color": "#007bff",
-                                                "fontWeight": "500",
-                                            },
-                                        ),
-                                    ],
-                                    className="text-muted",
-                                ),
-                            ],
-                            # Remove horizontal padding/margin on the right side
-                            className="d-flex justify-content-end pr-0",
-                            style={"paddingRight": "0", "marginRight": "0"},
-                        ),
-                    ],
-                    md=7,
-                    # Fix the column padding to match the card containers
-                    className="px-3",  # Match Bootstrap's default card padding
-                ),
-            ],
-            # Match the row padding to the card containers
-            className="border-bottom pb-2 mb-3 mx-0",
-            style={"marginRight": "0"},
-        ),
-        # Add tab navigation with renamed tabs
-        dbc.Tabs(
-            [
-                dbc.Tab(
-                    # This tab contains all the existing main content
-                    dbc.Row(
+                                    # Relation selection (now directly here, not in tabs)
+                                    html.Div(
+                                        [
+                                            html.Label("Relation 1 (R1):"),
+                                            dcc.Dropdown(
+                                                id="relation1-dropdown",
+                                                options=[
+                                                    {
+                                                        "label": f"{rel} - {RELATION_NAMES[rel]}",
+                                                        "value": rel,
+                                                    }
+                                                    for rel in ALLEN_RELATIONS
+                                                ],
+                                                value=ALLEN_RELATIONS[0],
+                                                clearable=False,
+                                                className="mb-3",
+                                            ),
+                                            html.Label("Relation 2 (R2):"),
+                                            dcc.Dropdown(
+                                                id="relation2-dropdown",
+                                                options=[
+                                                    {
+                                                        "label": f"{rel} - {RELATION_NAMES[rel]}",
+                                                        "value": rel,
+                                                    }
+                                                    for rel in ALLEN_RELATIONS
+                                                ],
+                                                value=ALLEN_RELATIONS[12],
+                                                clearable=False,
+                                                className="mb-4",
+                                            ),
+                                        ],
+                                        className="mt-3",
+                                    ),
+                                    # Run button
+                                    dbc.Button(
+                                        "Run Composition",
+                                        id="run-composition-button",
+                                        color="primary",
+                                        size="lg",
+                                        className="w-100",
+                                    ),
+                                ],
+                            ),
+                        ]
+                    ),
+                    # Results Summary
+                    dbc.Card(
                         [
-                            dbc.Col(
+                            dbc.CardHeader("Composition Results"),
+                            dbc.CardBody(
                                 [
-                                    dbc.Card(
+                                    html.Div(id="composition-summary"),
+                                    # Styled container with pale green background
+                                    html.Div(
                                         [
-                                            dbc.CardHeader("Simulation Parameters"),
-                                            dbc.CardBody(
+                                            html.Div(
                                                 [
-                                                    # Birth probability with slider and precise input field
-                                                    html.Label(
-                                                        "Birth Probability (pBorn):"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="p-born-slider",
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.05,
-                                                                    value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="p-born-input",
-                                                                    type="number",
-                                                                    value=0.5,
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
-                                                        ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    # Death probability with slider and precise input field
-                                                    html.Label(
-                                                        "Death Probability (pDie):"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="p-die-slider",
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.05,
-                                                                    value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="p-die-input",
-                                                                    type="number",
-                                                                    value=0.5,
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
-                                                        ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    # Small helper text for precise value input
-                                                    html.Small(
-                                                        "Use input fields for precise values (e.g. 0.001)",
-                                                        className="text-muted d-block mb-3",
-                                                    ),
-                                                    html.Label("Number of Trials:"),
-                                                    dbc.Input(
-                                                        id="trials-input",
-                                                        type="number",
-                                                        min=100,
-                                                        step=100,
-                                                        value=100000,
-                                                        className="mb-4",
+                                                    html.Strong(
+                                                        "Total valid relations: "
                                                     ),
-                                                    dbc.Button(
-                                                        "Run Simulation",
-                                                        id="run-button",
-                                                        color="primary",
-                                                        size="lg",
-                                                        className="w-100 mb-2",
-                                                    ),
-                                                    dbc.Button(
-                                                        "Export Results as CSV",
-                                                        id="export-csv-button",
-                                                        color="secondary",
-                                                        size="sm",
-                                                        className="w-100 mt-2",
-                                                    ),
-                                                    dbc.Button(
-                                                        "Export Results as JSON",
-                                                        id="export-json-button",
-                                                        color="info",
-                                                        size="sm",
-                                                        className="w-100 mt-2",
+                                                    html.Span(
+                                                        id="comp-valid-count",
+                                                        children="0",
                                                     ),
-                                                ]
+                                                ],
+                                                className="mb-2 text-left",
                                             ),
-                                        ]
-                                    ),
-                                    dbc.Card(
-                                        [
-                                            dbc.CardHeader("Simulation History"),
-                                            dbc.CardBody(
+                                            html.Div(
                                                 [
-                                                    html.Div(id="history-summary"),
-                                                    html.P(
-                                                        "Total runs: ",
-                                                        className="mb-0 mt-2 font-weight-bold",
-                                                    ),
-                                                    html.Span(
-                                                        id="total-runs", children="0"
-                                                    ),
-                                                    html.P(
-                                                        "Last run: ",
-                                                        className="mb-0 mt-2 font-weight-bold",
-                                                    ),
+                                                    html.Strong("Most common result: "),
                                                     html.Span(
-                                                        id="last-run-time",
+                                                        id="comp-most-common",
                                                         children="None",
                                                     ),
-                                                    html.Div(
-                                                        [
-                                                            html.Hr(className="my-2"),
-                                                            html.P(
-                                                                "Model Fit Analysis:",
-                                                                className="mb-0 mt-2 font-weight-bold",
-                                                            ),
-                                                            dbc.Alert(
-                                                                id="best-fit-detail",
-                                                                color="info",
-                                                                className="mt-1 p-2",
-                                                                children="No simulation yet",
-                                                            ),
-                                                        ],
-                                                        className="mt-2",
-                                                    ),
-                                                ]
+                                                ],
+                                                className="mb-1 text-left",
                                             ),
                                         ],
-                                        className="mt-3",
+                                        className="mt-3 p-3 rounded",
+                                        style={
+                                            "backgroundColor": "#e8f5e9",  # Pale green
+                                            "border": "1px solid #c8e6c9",
+                                            "textAlign": "left",
+                                        },
                                     ),
-                                    # Add the entropy heatmap below Simulation History
-                                    dbc.Card(
+                                ],
+                            ),
+                        ],
+                        className="mt-3",
+                    ),
+                    dbc.Card(
+                        [
+                            dbc.CardBody(
+                                [
+                                    html.Label("Max denominator for fraction display:"),
+                                    dbc.Row(
                                         [
-                                            dbc.CardHeader("Entropy Heatmap"),
-                                            dbc.CardBody(
-                                                [
-                                                    html.P(
-                                                        "Heat map shows entropy across parameter space",
-                                                        className="text-muted small mb-2",
-                                                    ),
-                                                    dcc.Graph(
-                                                        id="entropy-heatmap",
-                                                        config={
-                                                            "displayModeBar": False
-                                                        },
-                                                        style={"height": "250px"},
-                                                    ),
-                                                ]
+                                            dbc.Col(
+                                                dcc.Slider(
+                                                    id="comp-max-denominator-slider",
+                                                    min=2,
+                                                    max=100,
+                                                    step=1,
+                                                    value=30,
+                                                    marks=DENOMINATOR_MARKS,
+                                                    tooltip=SLIDER_TOOLTIP,
+                                                ),
+                                                width=9,
+                                            ),
+                                            dbc.Col(
+                                                dbc.Input(
+                                                    id="comp-max-denominator-input",
+                                                    type="number",
+                                                    value=30,
+                                                    min=1,
+                                                    max=1000,
+                                                    step=1,
+                                                    # Debounced as max-denominator-input
+                                                    debounce=300,
+                                                    style=NUMBER_INPUT_STYLE,
+                                                ),
+                                                width=3,
                                             ),
                                         ],
-                                        className="mt-3",
+                                        className="mb-3 align-items-center",
                                     ),
-                                    dbc.Card(
+                                    html.Small(
+                                        "Higher values give more precise fractions but may be harder to read",
+                                        className="text-muted d-block mb-2",
+                                    ),
+                                    html.Small(
+                                        "full = (pmoFDseSdfOMP) and concur = (oFDseSdfO) in order to conserve space",
+                                        className="text-muted d-block mb-2",
+                                    ),
+                                ]
+                            ),
+                        ],
+                        className="mt-3 mb-3",
+                    ),
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Load Previous Results"),
+                            dbc.CardBody(
+                                [
+                                    html.P("Upload previously saved JSON results:"),
+                                    dcc.Upload(
+                                        id="upload-comp-json",
+                                        children=html.Div(
+                                            [
+                                                "Drag and Drop or ",
+                                                html.A("Select File"),
+                                            ]
+                                        ),
+                                        style=UPLOAD_STYLE,
+                                        multiple=False,
+                                        accept="application/json",
+                                    ),
+                                    html.Div(id="upload-comp-json-status"),
+                                    html.Small(
+                                        "Files should be named comp_p[value]_q[value].json",
+                                        className="text-muted d-block mt-2",
+                                    ),
+                                ]
+                            ),
+                        ],
+                        className="mt-3 mb-3",
+                    ),
+                ],
+                md=4,
+                id="composition-left-panel",
+            ),
+            dbc.Col(
+                [
+                    dbc.Spinner(
+                        children=[
+                            # Single composition view
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(
+                                        id="composition-title",
+                                        children="Select Relations and Run Composition",
+                                    ),
+                                    dbc.CardBody(
                                         [
-                                            dbc.CardBody(
-                                                [
-                                                    html.Label(
-                                                        "Max denominator for fraction display:"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="max-denominator-slider",
-                                                                    min=2,
-                                                                    max=100,
-                                                                    step=1,
-                                                                    value=30,
-                                                                    marks={
-                                                                        i: str(i)
-                                                                        for i in range(
-                                                                            10, 101, 10
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="max-denominator-input",
-                                                                    type="number",
-                                                                    value=30,
-                                                                    min=1,
-                                                                    max=1000,
-                                                                    step=1,
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
+                                            # Results chart
+                                            dcc.Graph(id="composition-chart"),
+                                            # Results table
+                                            html.Div(
+                                                id="composition-table-container",
+                                                className="mt-4",
+                                                children=[
+                                                    html.H5("Composition Results"),
+                                                    dash_table.DataTable(
+                                                        id="composition-table",
+                                                        columns=[
+                                                            {
+                                                                "name": "Relation",
+                                                                "id": "relation",
+                                                            },
+                                                            {
+                                                                "name": "Name",
+                                                                "id": "name",
+                                                            },
+                                                            {
+                                                                "name": "Count",
+                                                                "id": "count",
+                                                            },
+                                                            {
+                                                                "name": "Percentage",
+                                                                "id": "percentage",
+                                                            },
+                                                            {
+                                                                "name": "≈ Fraction",
+                                                                "id": "fraction",
+                                                            },
+                                                        ],
+                                                        style_table={
+                                                            "overflowX": "auto"
+                                                        },
+                                                        style_cell={
+                                                            "textAlign": "left",
+                                                            "padding": "8px",
+                                                        },
+                                                        style_header={
+                                                            "backgroundColor": "#f8f9fa",
+                                                            "fontWeight": "bold",
+                                                        },
+                                                        style_data_conditional=[
+                                                            {
+                                                                "if": {
+                                                                    "state": "selected"
+                                                                },
+                                                                "backgroundColor": "#e6f2ff",
+                                                                "border": "1px solid #ccc",
+                                                            }
                                                         ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    html.Small(
-                                                        "Higher values give more precise fractions but may be harder to read",
-                                                        className="text-muted d-block mb-2",
                                                     ),
-                                                ]
+                                                ],
                                             ),
-                                        ],
-                                        className="mt-3 mb-3",
+                                        ]
                                     ),
-                                    dbc.Card(
-                                        [
-                                            dbc.CardHeader("Load Previous Results"),
-                                            dbc.CardBody(
-                                                [
-                                                    html.P(
-                                                        "Upload previously saved JSON results:"
-                                                    ),
-                                                    dcc.Upload(
-                                                        id="upload-json",
-                                                        children=html.Div(
-                                                            [
-                                                                "Drag and Drop or ",
-                                                                html.A("Select File"),
-                                                            ]
-                                                        ),
-                                                        style={
-                                                            "width": "100%",
-                                                            "height": "60px",
-                                                            "lineHeight": "60px",
-                                                            "borderWidth": "1px",
-                                                            "borderStyle": "dashed",
-                                                            "borderRadius": "5px",
-                                                            "textAlign": "center",
-                                                            "margin-bottom": "10px",
-                                                        },
-                                                        multiple=False,
-                                                        accept="application/json",
-                                                    ),
-                                                    html.Div(id="upload-json-status"),
-                                                    html.Small(
-                                                        "Files should be named sim_p[value]_q[value].json",
-                                                        className="text-muted d-block mt-2",
-                                                    ),
-                                                ]
-                                            ),
-                                        ],
-                                        className="mt-3 mb-3",
-                                    ),
-                                ],
-                                md=4,
-                            ),
-                            dbc.Col(
-                                [
-                                    dbc.Spinner(
-                                        children=[
-                                            dbc.Card(
-                                                [
-                                                    dbc.CardHeader(
-                                                        "Relation Distribution"
-                                                    ),
-                                                    dbc.CardBody(
-                                                        [
-                                                            dbc.Row(
-                                                                [
-                                                                    dbc.Col(
-                                                                        html.Label(
-                                                                            "Show reference models:",
-                                                                            className="font-weight-bold mr-2",
-                                                                        ),
-                                                                        width="auto",
-                                                                    ),
-                                                                    dbc.Col(
-                                                                        dcc.Checklist(
-                                                                            id="model-checklist",
-                                                                            options=[
-                                                                                {
-                                                                                    "label": "Uniform",
-                                                                                    "value": "Uniform",
-                                                                                },
-                                                                                {
-                                                                                    "label": "Fernando-Vogel",
-                                                                                    "value": "Fernando-Vogel",
-                                                                                },
-                                                                                {
-                                                                                    "label": "Suliman",
-                                                                                    "value": "Suliman",
-                                                                                },
-                                                                            ],
-                                                                            value=[],
-                                                                            inline=True,
-                                                                            className="mb-2",
-                                                                            inputStyle={
-                                                                                "margin-right": "5px"
-                                                                            },
-                                                                            labelStyle={
-                                                                                "margin-right": "15px"
-                                                                            },
-                                                                        ),
-                                                                    ),
-                                                                    # Add sorting checkbox
-                                                                    dbc.Col(
-                                                                        dcc.Checklist(
-                                                                            id="sort-checkbox",
-                                                                            options=[
-                                                                                {
-                                                                                    "label": "Sort relations by frequency",
-                                                                                    "value": "sort",
-                                                                                }
-                                                                            ],
-                                                                            value=[],
-                                                                            inline=True,
-                                                                            className="mb-2",
-                                                                            inputStyle={
-                                                                                "margin-right": "5px"
-                                                                            },
-                                                                        ),
-                                                                        width=True,
-                                                                        className="text-right",
-                                                                    ),
-                                                                ],
-                                                                className="mb-3 d-flex align-items-center",
-                                                            ),
-                                                            dcc.Graph(
-                                                                id="relation-chart"
-                                                            ),
-                                                            dbc.Row(
-                                                                [
-                                                                    dbc.Col(
-                                                                        html.Div(
-                                                                            id="mode-display",
-                                                                            className="mt-2 text-muted",
-                                                                            style={
-                                                                                "font-size": "0.9rem"
-                                                                            },
-                                                                        ),
-                                                                        width="auto",
-                                                                    ),
-                                                                    dbc.Col(
-                                                                        html.Div(
-                                                                            dbc.Button(
-                                                                                "Export as PNG",
-                                                                                id="export-button",
-                                                                                color="secondary",
-                                                                                className="mt-2",
-                                                                            ),
-                                                                            className="d-flex justify-content-end",
-                                                                        ),
-                                                                        width=True,
-                                                                    ),
-                                                                ],
-                                                                className="d-flex justify-content-between align-items-center",
-                                                            ),
-                                                        ]
-                                                    ),
-                                                ],
-                                                className="mb-3",
-                                            ),
-                                            dbc.Row(
-                                                [
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "Entropy"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H3(
-                                                                            id="entropy-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=3,
-                                                    ),
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "Gini Coefficient"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H3(
-                                                                            id="gini-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=3,
-                                                    ),
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "Std Dev"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H3(
-                                                                            id="stddev-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=3,
-                                                    ),
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "Best Fit"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.Div(
-                                                                            id="best-fit-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=3,
-                                                    ),
-                                                ],
-                                                className="mb-3",
-                                            ),
-                                            dbc.Row(
-                                                [
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "JS (Uniform)"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H4(
-                                                                            id="js-uniform-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=4,
-                                                    ),
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "JS (F-V)"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H4(
-                                                                            id="js-fv-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=4,
-                                                    ),
-                                                    dbc.Col(
-                                                        [
-                                                            dbc.Card(
-                                                                [
-                                                                    dbc.CardHeader(
-                                                                        "JS (Suliman)"
-                                                                    ),
-                                                                    dbc.CardBody(
-                                                                        html.H4(
-                                                                            id="js-suliman-value",
-                                                                            className="text-center",
-                                                                        )
-                                                                    ),
-                                                                ]
-                                                            )
-                                                        ],
-                                                        md=4,
-                                                    ),
-                                                ],
-                                                className="mb-3",
-                                            ),
-                                            dbc.Card(
-                                                [
-                                                    dbc.CardHeader("Metrics History"),
-                                                    dbc.CardBody(
-                                                        dcc.Graph(id="metrics-chart")
-                                                    ),
-                                                ],
-                                                className="mb-3",
-                                            ),
-                                            dbc.Card(
-                                                [
-                                                    dbc.CardHeader("Detailed Results"),
-                                                    dbc.CardBody(
-                                                        dash_table.DataTable(
-                                                            id="results-table",
-                                                            columns=[
-                                                                {
-                                                                    "name": "Relation",
-                                                                    "id": "relation",
-                                                                },
-                                                                {
-                                                                    "name": "Name",
-                                                                    "id": "name",
-                                                                },
-                                                                {
-                                                                    "name": "Count",
-                                                                    "id": "count",
-                                                                },
-                                                                {
-                                                                    "name": "Probability",
-                                                                    "id": "probability",
-                                                                },
-                                                                {
-                                                                    "name": "≈ Fraction",
-                                                                    "id": "fraction",
-                                                                },
-                                                            ],
-                                                            style_table={
-                                                                "overflowX": "auto"
-                                                            },
-                                                            style_cell={
-                                                                "textAlign": "left",
-                                                                "padding": "8px",
-                                                            },
-                                                            style_header={
-                                                                "backgroundColor": "#f8f9fa",
-                                                                "fontWeight": "bold",
-                                                            },
-                                                            style_data_conditional=[
-                                                                {
-                                                                    "if": {
-                                                                        "state": "selected"
-                                                                    },
-                                                                    "backgroundColor": "#e6f2ff",
-                                                                    "border": "1px solid #ccc",
-                                                                }
-                                                            ],
-                                                        )
-                                                    ),
-                                                ]
-                                            ),
-                                        ],
-                                        id="loading-spinner",
-                                        type="border",
-                                        fullscreen=False,
-                                        color="primary",
-                                    )
-                                ],
-                                md=8,
-                            ),
-                        ]
-                    ),
-                    label="Relation Simulation",  # Renamed from "Distribution Simulator"
-                    tab_id="tab-simulator",
-                    active_label_style={"font-weight": "bold"},
-                ),
-                dbc.Tab(
-                    # Composition Analysis tab - Now only contains single composition analysis
-                    dbc.Row(
-                        [
-                            dbc.Col(
-                                [
-                                    # Parameters Card
-                                    dbc.Card(
-                                        [
-                                            dbc.CardHeader("Simulation Parameters"),
-                                            dbc.CardBody(
-                                                [
-                                                    # Birth probability with slider and precise input field
-                                                    html.Label(
-                                                        "Birth Probability (pBorn):"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="comp-p-born-slider",
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.05,
-                                                                    value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="comp-p-born-input",
-                                                                    type="number",
-                                                                    value=0.5,
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
-                                                        ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    # Death probability with slider and precise input field
-                                                    html.Label(
-                                                        "Death Probability (pDie):"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="comp-p-die-slider",
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.05,
-                                                                    value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="comp-p-die-input",
-                                                                    type="number",
-                                                                    value=0.5,
-                                                                    min=0.0,
-                                                                    max=1.0,
-                                                                    step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
-                                                        ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    # Small helper text for precise value input
-                                                    html.Small(
-                                                        "Use input fields for precise values (e.g. 0.001)",
-                                                        className="text-muted d-block mb-3",
-                                                    ),
-                                                    html.Label("Number of Trials:"),
-                                                    dbc.Input(
-                                                        id="comp-trials-input",
-                                                        type="number",
-                                                        min=1000,
-                                                        step=1000,
-                                                        value=100000,
-                                                        className="mb-3",
-                                                    ),
-                                                    html.Label("Results Limit:"),
-                                                    dbc.Input(
-                                                        id="comp-limit-input",
-                                                        type="number",
-                                                        min=100,
-                                                        step=100,
-                                                        value=100000,
-                                                        className="mb-4",
-                                                    ),
-                                                    # Relation selection (now directly here, not in tabs)
-                                                    html.Div(
-                                                        [
-                                                            html.Label(
-                                                                "Relation 1 (R1):"
-                                                            ),
-                                                            dcc.Dropdown(
-                                                                id="relation1-dropdown",
-                                                                options=[
-                                                                    {
-                                                                        "label": f"{rel} - {RELATION_NAMES[rel]}",
-                                                                        "value": rel,
-                                                                    }
-                                                                    for rel in ALLEN_RELATIONS
-                                                                ],
-                                                                value=ALLEN_RELATIONS[
-                                                                    0
-                                                                ],
-                                                                clearable=False,
-                                                                className="mb-3",
-                                                            ),
-                                                            html.Label(
-                                                                "Relation 2 (R2):"
-                                                            ),
-                                                            dcc.Dropdown(
-                                                                id="relation2-dropdown",
-                                                                options=[
-                                                                    {
-                                                                        "label": f"{rel} - {RELATION_NAMES[rel]}",
-                                                                        "value": rel,
-                                                                    }
-                                                                    for rel in ALLEN_RELATIONS
-                                                                ],
-                                                                value=ALLEN_RELATIONS[
-                                                                    12
-                                                                ],
-                                                                clearable=False,
-                                                                className="mb-4",
-                                                            ),
-                                                        ],
-                                                        className="mt-3",
-                                                    ),
-                                                    # Run button
-                                                    dbc.Button(
-                                                        "Run Composition",
-                                                        id="run-composition-button",
-                                                        color="primary",
-                                                        size="lg",
-                                                        className="w-100",
-                                                    ),
-                                                ],
+                                ]
+                            ),
+                            # Add reference tables to right panel, below the composition results
+                            html.Div(
+                                [
+                                    html.Hr(className="mt-4"),
+                                    get_reference_tables(),
+                                ],
+                                className="mt-4",
+                                style={"width": "100%"},
+                            ),
+                        ],
+                        id="composition-spinner",
+                        type="border",
+                        fullscreen=False,
+                        color="primary",
+                    )
+                ],
+                md=8,
+            ),
+        ]
+    )
+
+
+# Matrix Analysis tab
+def matrix_tab_body():
+    return dbc.Row(
+        [
+            dbc.Col(
+                [
+                    # Matrix Parameters Card
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Matrix Parameters"),
+                            dbc.CardBody(
+                                [
+                                    # Birth probability with slider and precise input field
+                                    html.Label("Birth Probability (pBorn):"),
+                                    dbc.Row(
+                                        [
+                                            dbc.Col(
+                                                dcc.Slider(
+                                                    id="matrix-p-born-slider",
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.05,
+                                                    value=0.5,
+                                                    marks=PROBABILITY_MARKS,
+                                                    tooltip=SLIDER_TOOLTIP,
+                                                ),
+                                                width=9,
                                             ),
-                                        ]
+                                            dbc.Col(
+                                                dbc.Input(
+                                                    id="matrix-p-born-input",
+                                                    type="number",
+                                                    value=0.5,
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.0001,  # Changed from 0.1 to 0.001
+                                                    style=NUMBER_INPUT_STYLE,
+                                                ),
+                                                width=3,
+                                            ),
+                                        ],
+                                        className="mb-3 align-items-center",
                                     ),
-                                    # Results Summary
-                                    dbc.Card(
+                                    # Death probability with slider and precise input field
+                                    html.Label("Death Probability (pDie):"),
+                                    dbc.Row(
                                         [
-                                            dbc.CardHeader("Composition Results"),
-                                            dbc.CardBody(
-                                                [
-                                                    html.Div(id="composition-summary"),
-                                                    # Styled container with pale green background
-                                                    html.Div(
-                                                        [
-                                                            html.Div(
-                                                                [
-                                                                    html.Strong(
-                                                                        "Total valid relations: "
-                                                                    ),
-                                                                    html.Span(
-                                                                        id="comp-valid-count",
-                                                                        children="0",
-                                                                    ),
-                                                                ],
-                                                                className="mb-2 text-left",
-                                                            ),
-                                                            html.Div(
-                                                                [
-                                                                    html.Strong(
-                                                                        "Most common result: "
-                                                                    ),
-                                                                    html.Span(
-                                                                        id="comp-most-common",
-                                                                        children="None",
-                                                                    ),
-                                                                ],
-                                                                className="mb-1 text-left",
-                                                            ),
-                                                        ],
-                                                        className="mt-3 p-3 rounded",
-                                                        style={
-                                                            "backgroundColor": "#e8f5e9",  # Pale green
-                                                            "border": "1px solid #c8e6c9",
-                                                            "textAlign": "left",
-                                                        },
-                                                    ),
-                                                ],
+                                            dbc.Col(
+                                                dcc.Slider(
+                                                    id="matrix-p-die-slider",
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.05,
+                                                    value=0.5,
+                                                    marks=PROBABILITY_MARKS,
+                                                    tooltip=SLIDER_TOOLTIP,
+                                                ),
+                                                width=9,
+                                            ),
+                                            dbc.Col(
+                                                dbc.Input(
+                                                    id="matrix-p-die-input",
+                                                    type="number",
+                                                    value=0.5,
+                                                    min=0.0,
+                                                    max=1.0,
+                                                    step=0.0001,  # Changed from 0.1 to 0.001
+                                                    style=NUMBER_INPUT_STYLE,
+                                                ),
+                                                width=3,
                                             ),
                                         ],
-                                        className="mt-3",
+                                        className="mb-3 align-items-center",
                                     ),
-                                    dbc.Card(
+                                    # Small helper text for precise value input
+                                    html.Small(
+                                        "Use input fields for precise values (e.g. 0.001)",
+                                        className="text-muted d-block mb-3",
+                                    ),
+                                    html.Label("Number of Trials:"),
+                                    dbc.Input(
+                                        id="matrix-trials-input",
+                                        type="number",
+                                        min=1000,
+                                        step=1000,
+                                        value=100000,
+                                        className="mb-3",
+                                    ),
+                                    html.Label("Results Limit:"),
+                                    dbc.Input(
+                                        id="matrix-limit-input",
+                                        type="number",
+                                        min=100,
+                                        step=100,
+                                        value=100000,
+                                        className="mb-4",
+                                    ),
+                                    html.Small(
+                                        "full=(pmoFDseSdfOMP) and concur=(oFDseSdfO)",
+                                        className="text-muted d-block mb-3",
+                                    ),
+                                    # Run button
+                                    dbc.Button(
+                                        "Calculate Full Matrix",
+                                        id="run-matrix-button",
+                                        color="primary",
+                                        size="lg",
+                                        className="w-100 mt-4",
+                                    ),
+                                ],
+                            ),
+                        ]
+                    ),
+                    # Matrix Results Status Card
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Matrix Status"),
+                            dbc.CardBody(
+                                html.Div(id="matrix-status", className="mt-0")
+                            ),
+                        ],
+                        className="mt-3",
+                    ),
+                    # Global Statistics Card (moved from right panel)
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Global Statistics"),
+                            dbc.CardBody(
+                                html.Div(
+                                    id="matrix-global-stats",
+                                    className="p-3 rounded",
+                                    style={
+                                        "backgroundColor": "#e8f5e9",  # Pale green
+                                        "border": "1px solid #c8e6c9",
+                                        "textAlign": "left",
+                                    },
+                                )
+                            ),
+                        ],
+                        className="mt-3 mb-3",
+                    ),
+                    # Fraction denominator control is removed
+                    dbc.Card(
+                        [
+                            dbc.CardHeader("Load Previous Results"),
+                            dbc.CardBody(
+                                [
+                                    html.P("Upload previously saved JSON results:"),
+                                    dcc.Upload(
+                                        id="upload-matrix-json",
+                                        children=html.Div(
+                                            [
+                                                "Drag and Drop or ",
+                                                html.A("Select File"),
+                                            ]
+                                        ),
+                                        style=UPLOAD_STYLE,
+                                        multiple=False,
+                                        accept="application/json",
+                                    ),
+                                    html.Div(id="upload-matrix-json-status"),
+                                    html.Small(
+                                        "Files should be named comp_p[value]_q[value].json",
+                                        className="text-muted d-block mt-2",
+                                    ),
+                                ]
+                            ),
+                        ],
+                        className="mt-3 mb-3",
+                    ),
+                ],
+                md=4,
+                id="matrix-left-panel",
+            ),
+            dbc.Col(
+                [
+                    dbc.Spinner(
+                        children=[
+                            # Matrix view card
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(
+                                        html.H5(
+                                            "Allen Relation Composition Matrix",
+                                            className="mb-0",
+                                            id="matrix-title",
+                                        )
+                                    ),
+                                    dbc.CardBody(
                                         [
-                                            dbc.CardBody(
+                                            # Global Statistics Card removed from here
+                                            html.P(
+                                                "The matrix shows the composition of Allen relations R1 (rows) with R2 (columns).",
+                                                className="text-muted",
+                                            ),
+                                            html.P(
                                                 [
-                                                    html.Label(
-                                                        "Max denominator for fraction display:"
-                                                    ),
-                                                    dbc.Row(
-                                                        [
-                                                            dbc.Col(
-                                                                dcc.Slider(
-                                                                    id="comp-max-denominator-slider",
-                                                                    min=2,
-                                                                    max=100,
-                                                                    step=1,
-                                                                    value=30,
-                                                                    marks={
-                                                                        i: str(i)
-                                                                        for i in range(
-                                                                            10, 101, 10
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
-                                                                ),
-                                                                width=9,
-                                                            ),
-                                                            dbc.Col(
-                                                                dbc.Input(
-                                                                    id="comp-max-denominator-input",
-                                                                    type="number",
-                                                                    value=30,
-                                                                    min=1,
-                                                                    max=1000,
-                                                                    step=1,
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
-                                                                ),
-                                                                width=3,
-                                                            ),
-                                                        ],
-                                                        className="mb-3 align-items-center",
-                                                    ),
-                                                    html.Small(
-                                                        "Higher values give more precise fractions but may be harder to read",
-                                                        className="text-muted d-block mb-2",
-                                                    ),
-                                                    html.Small(
-                                                        "full = (pmoFDseSdfOMP) and concur = (oFDseSdfO) in order to conserve space",
-                                                        className="text-muted d-block mb-2",
+                                                    "Hover over cells to see detailed composition results."
+                                                ],
+                                                className="text-muted small",
+                                            ),
+                                            html.Div(
+                                                dcc.Loading(
+                                                    id="loading-matrix",
+                                                    type="default",
+                                                    children=dcc.Graph(
+                                                        id="matrix-heatmap",
+                                                        config={"responsive": True},
+                                                        style={"height": "700px"},
                                                     ),
-                                                ]
+                                                ),
                                             ),
-                                        ],
-                                        className="mt-3 mb-3",
+                                            html.Div(
+                                                id="cell-details",
+                                                className="mt-3",
+                                            ),
+                                        ]
                                     ),
-                                    dbc.Card(
+                                ]
+                            ),
+                            # Add the two new visualization cards
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(
+                                        "Entropy Heatmap of Composition Outcomes"
+                                    ),
+                                    dbc.CardBody(
                                         [
-                                            dbc.CardHeader("Load Previous Results"),
-                                            dbc.CardBody(
-                                                [
-                                                    html.P(
-                                                        "Upload previously saved JSON results:"
-                                                    ),
-                                                    dcc.Upload(
-                                                        id="upload-comp-json",
-                                                        children=html.Div(
-                                                            [
-                                                                "Drag and Drop or ",
-                                                                html.A("Select File"),
-                                                            ]
-                                                        ),
-                                                        style={
-                                                            "width": "100%",
-                                                            "height": "60px",
-                                                            "lineHeight": "60px",
-                                                            "borderWidth": "1px",
-                                                            "borderStyle": "dashed",
-                                                            "borderRadius": "5px",
-                                                            "textAlign": "center",
-                                                            "margin-bottom": "10px",
-                                                        },
-                                                        multiple=False,
-                                                        accept="application/json",
-                                                    ),
-                                                    html.Div(
-                                                        id="upload-comp-json-status"
-                                                    ),
-                                                    html.Small(
-                                                        "Files should be named comp_p[value]_q[value].json",
-                                                        className="text-muted d-block mt-2",
-                                                    ),
-                                                ]
+                                            html.P(
+                                                "This heatmap shows the entropy (uncertainty) of R3 outcomes for each composition pair.",
+                                                className="text-muted",
                                             ),
-                                        ],
-                                        className="mt-3 mb-3",
+                                            dcc.Graph(
+                                                id="entropy-composition-heatmap",
+                                                config={"responsive": True},
+                                                style={"height": "500px"},
+                                            ),
+                                        ]
+                                    ),
+                                ],
+                                className="mt-4",
+                            ),
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader("Global R3 Distribution"),
+                                    dbc.CardBody(
+                                        [
+                                            html.P(
+                                                "This chart shows the overall probability of each Allen relation appearing as an R3 outcome across all compositions.",
+                                                className="text-muted",
+                                            ),
+                                            dcc.Graph(
+                                                id="global-r3-distribution",
+                                                config={"responsive": True},
+                                                style={"height": "400px"},
+                                            ),
+                                        ]
+                                    ),
+                                ],
+                                className="mt-4",
+                            ),
+                            # Add reference tables to right panel, below the matrix
+                            html.Div(
+                                [
+                                    html.Hr(className="mt-4"),
+                                    get_reference_tables(),
+                                ],
+                                className="mt-4",
+                                style={"width": "100%"},
+                            ),
+                        ],
+                        id="matrix-spinner",
+                        type="border",
+                        fullscreen=False,
+                        color="primary",
+                    )
+                ],
+                md=8,
+            ),
+        ]
+    )
+
+
+# Create the layout with a more compact header and improved styling with proper edge alignment
+app.layout = dbc.Container(
+    [
+        # Redesigned compact header section with properly aligned right edges
+        dbc.Row(
+            [
+                # Left side - Title
+                dbc.Col(
+                    html.H2(
+                        "Probabilities of Allen Interval Relations", className="mt-3"
+                    ),
+                    md=5,
+                ),
+                # Right side - With consistent right alignment that matches other containers
+                dbc.Col(
+                    [
+                        # Badges with better spacing and alignment
+                        html.Div(
+                            [
+                                html.A(
+                                    html.Img(
+                                        src="https://img.shields.io/badge/License-MIT-yellow.svg",
+                                        alt="MIT License",
+                                    ),
+                                    href="https://github.com/vxrdis/allen-interval-probabilities/blob/main/LICENSE",
+                                    className="d-inline-block mx-2",
+                                    style={"textDecoration": "none"},
+                                ),
+                                html.A(
+                                    html.Img(
+                                        src="https://img.shields.io/badge/Python-3.9-blue.svg",
+                                        alt="Python 3.9",
+                                    ),
+                                    href="https://www.python.org/downloads/release/python-396/",
+                                    className="d-inline-block mx-2",
+                                    style={"textDecoration": "none"},
+                                ),
+                                html.A(
+                                    html.Img(
+                                        src="https://img.shields.io/github/last-commit/vxrdis/allen-interval-probabilities",
+                                        alt="Last Commit",
+                                    ),
+                                    href="https://github.com/vxrdis/allen-interval-probabilities/commits/main",
+                                    className="d-inline-block mx-2",
+                                    style={"textDecoration": "none"},
+                                ),
+                                html.A(
+                                    html.Img(
+                                        src="https://img.shields.io/github/repo-size/vxrdis/allen-interval-probabilities",
+                                        alt="Repo Size",
+                                    ),
+                                    href="https://github.com/vxrdis/allen-interval-probabilities",
+                                    className="d-inline-block mx-2",
+                                    style={"textDecoration": "none"},
+                                ),
+                                html.A(
+                                    html.Img(
+                                        src="https://img.shields.io/badge/code%20style-black-000000.svg",
+                                        alt="Code Style: Black",
                                     ),
-                                ],
-                                md=4,
-                                id="composition-left-panel",
-                            ),
-                            dbc.Col(
-                                [
-                                    dbc.Spinner(
-                                        children=[
-                                            # Single composition view
-                                            dbc.Card(
-                                                [
-                                                    dbc.CardHeader(
-                                                        id="composition-title",
-                                                        children="Select Relations and Run Composition",
-                                                    ),
-                                                    dbc.CardBody(
-                                                        [
-                                                            # Results chart
-                                                            dcc.Graph(
-                                                                id="composition-chart"
-                                                            ),
-                                                            # Results table
-                                                            html.Div(
-                                                                id="composition-table-container",
-                                                                className="mt-4",
-                                                                children=[
-                                                                    html.H5(
-                                                                        "Composition Results"
-                                                                    ),
-                                                                    dash_table.DataTable(
-                                                                        id="composition-table",
-                                                                        columns=[
-                                                                            {
-                                                                                "name": "Relation",
-                                                                                "id": "relation",
-                                                                            },
-                                                                            {
-                                                                                "name": "Name",
-                                                                                "id": "name",
-                                                                            },
-                                                                            {
-                                                                                "name": "Count",
-                                                                                "id": "count",
-                                                                            },
-                                                                            {
-                                                                                "name": "Percentage",
-                                                                                "id": "percentage",
-                                                                            },
-                                                                            {
-                                                                                "name": "≈ Fraction",
-                                                                                "id": "fraction",
-                                                                            },
-                                                                        ],
-                                                                        style_table={
-                                                                            "overflowX": "auto"
-                                                                        },
-                                                                        style_cell={
-                                                                            "textAlign": "left",
-                                                                            "padding": "8px",
-                                                                        },
-                                                                        style_header={
-                                                                            "backgroundColor": "#f8f9fa",
-                                                                            "fontWeight": "bold",
-                                                                        },
-                                                                        style_data_conditional=[
-                                                                            {
-                                                                                "if": {
-                                                                                    "state": "selected"
-                                                                                },
-                                                                                "backgroundColor": "#e6f2ff",
-                                                                                "border": "1px solid #ccc",
-                                                                            }
-                                                                        ],
-                                                                    ),
-                                                                ],
-                                                            ),
-                                                        ]
-                                                    ),
-                                                ]
-                                            ),
-                                            # Add reference tables to right panel, below the composition results
-                                            html.Div(
-                                                [
-                                                    html.Hr(className="mt-4"),
-                                                    get_reference_tables(),
-                                                ],
-                                                className="mt-4",
-                                                style={"width": "100%"},
-                                            ),
-                                        ],
-                                        id="composition-spinner",
-                                        type="border",
-                                        fullscreen=False,
-                                        color="primary",
-                                    )
-                                ],
-                                md=8,
-                            ),
-                        ]
-                    ),
-                    label="Composition Analysis",
-                    tab_id="tab-composition",
-                    active_label_style={"font-weight": "bold"},
+                                    href="https://black.readthedocs.io/en/stable/",
+                                    className="d-inline-block mx-2",
+                                    style={"textDecoration": "none"},
+                                ),
+                            ],
+                            # Remove horizontal padding/margin on the right side
+                            className="d-flex justify-content-end flex-wrap mb-2 pr-0",
+                            style={"paddingRight": "0", "marginRight": "0"},
+                        ),
+                        # Project info with improved alignment
+                        html.Div(
+                            [
+                                html.Small(
+                                    [
+                                        "A ",
+                                        html.A(
+                                            "Final Year Project",
+                                            href="https://projects.scss.tcd.ie",
+                                            target="_blank",
+                                            rel="noopener noreferrer",
+                                            className="text-decoration-none",
+                                            style={
+                                                "color": "#007bff",
+                                                "fontWeight": "500",
+                                            },
+                                        ),
+                                        " by ",
+                                        html.Strong("Cillín Forrester"),
+                                        " under supervision of Dr ",
+                                        html.A(
+                                            "Tim Fernando",
+                                            href="https://www.scss.tcd.ie/Tim.Fernando/",
+                                            target="_blank",
+                                            rel="noopener noreferrer",
+                                            className="text-decoration-none",
+                                            style={
+                                                "color": "#007bff",
+                                                "fontWeight": "500",
+                                            },
+                                        ),
+                                        ", ",
+                                        html.A(
+                                            "School of Computer Science and Statistics",
+                                            href="https://www.tcd.ie/scss/",
+                                            target="_blank",
+                                            rel="noopener noreferrer",
+                                            className="text-decoration-none",
+                                            style={
+                                                "color": "#007bff",
+                                                "fontWeight": "500",
+                                            },
+                                        ),
+                                    ],
+                                    className="text-muted",
+                                ),
+                            ],
+                            # Remove horizontal padding/margin on the right side
+                            className="d-flex justify-content-end pr-0",
+                            style={"paddingRight": "0", "marginRight": "0"},
+                        ),
+                    ],
+                    md=7,
+                    # Fix the column padding to match the card containers
+                    className="px-3",  # Match Bootstrap's default card padding
                 ),
-                # NEW TAB FOR MATRIX ANALYSIS
+            ],
+            # Match the row padding to the card containers
+            className="border-bottom pb-2 mb-3 mx-0",
+            style={"marginRight": "0"},
+        ),
+        # Add tab navigation with renamed tabs
+        dbc.Tabs(
+            [
                 dbc.Tab(
+                    # This tab contains all the existing main content
                     dbc.Row(
                         [
                             dbc.Col(
                                 [
-                                    # Matrix Parameters Card
                                     dbc.Card(
                                         [
-                                            dbc.CardHeader("Matrix Parameters"),
+                                            dbc.CardHeader("Simulation Parameters"),
                                             dbc.CardBody(
                                                 [
                                                     # Birth probability with slider and precise input field
@@ -1379,36 +1210,25 @@ app.layout = dbc.Container(
                                                         [
                                                             dbc.Col(
                                                                 dcc.Slider(
-                                                                    id="matrix-p-born-slider",
+                                                                    id="p-born-slider",
                                                                     min=0.0,
                                                                     max=1.0,
                                                                     step=0.05,
                                                                     value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
+                                                                    marks=PROBABILITY_MARKS,
+                                                                    tooltip=SLIDER_TOOLTIP,
                                                                 ),
                                                                 width=9,
                                                             ),
                                                             dbc.Col(
                                                                 dbc.Input(
-                                                                    id="matrix-p-born-input",
+                                                                    id="p-born-input",
                                                                     type="number",
                                                                     value=0.5,
                                                                     min=0.0,
                                                                     max=1.0,
                                                                     step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
+                                                                    style=NUMBER_INPUT_STYLE,
                                                                 ),
                                                                 width=3,
                                                             ),
@@ -1423,36 +1243,25 @@ app.layout = dbc.Container(
                                                         [
                                                             dbc.Col(
                                                                 dcc.Slider(
-                                                                    id="matrix-p-die-slider",
+                                                                    id="p-die-slider",
                                                                     min=0.0,
                                                                     max=1.0,
                                                                     step=0.05,
                                                                     value=0.5,
-                                                                    marks={
-                                                                        i
-                                                                        / 10: f"{i/10:.1f}"
-                                                                        for i in range(
-                                                                            11
-                                                                        )
-                                                                    },
-                                                                    tooltip={
-                                                                        "placement": "bottom",
-                                                                        "always_visible": True,
-                                                                    },
+                                                                    marks=PROBABILITY_MARKS,
+                                                                    tooltip=SLIDER_TOOLTIP,
                                                                 ),
                                                                 width=9,
                                                             ),
                                                             dbc.Col(
                                                                 dbc.Input(
-                                                                    id="matrix-p-die-input",
+                                                                    id="p-die-input",
                                                                     type="number",
                                                                     value=0.5,
                                                                     min=0.0,
                                                                     max=1.0,
                                                                     step=0.0001,  # Changed from 0.1 to 0.001
-                                                                    style={
-                                                                        "height": "38px"
-                                                                    },
+                                                                    style=NUMBER_INPUT_STYLE,
                                                                 ),
                                                                 width=3,
                                                             ),
@@ -1466,69 +1275,150 @@ app.layout = dbc.Container(
                                                     ),
                                                     html.Label("Number of Trials:"),
                                                     dbc.Input(
-                                                        id="matrix-trials-input",
-                                                        type="number",
-                                                        min=1000,
-                                                        step=1000,
-                                                        value=100000,
-                                                        className="mb-3",
-                                                    ),
-                                                    html.Label("Results Limit:"),
-                                                    dbc.Input(
-                                                        id="matrix-limit-input",
+                                                        id="trials-input",
                                                         type="number",
                                                         min=100,
                                                         step=100,
                                                         value=100000,
                                                         className="mb-4",
                                                     ),
+                                                    dbc.Button(
+                                                        "Run Simulation",
+                                                        id="run-button",
+                                                        color="primary",
+                                                        size="lg",
+                                                        className="w-100 mb-2",
+                                                    ),
+                                                    dbc.Button(
+                                                        "Export Results as CSV",
+                                                        id="export-csv-button",
+                                                        color="secondary",
+                                                        size="sm",
+                                                        className="w-100 mt-2",
+                                                    ),
+                                                    dbc.Button(
+                                                        "Export Results as JSON",
+                                                        id="export-json-button",
+                                                        color="info",
+                                                        size="sm",
+                                                        className="w-100 mt-2",
+                                                    ),
+                                                ]
+                                            ),
+                                        ]
+                                    ),
+                                    dbc.Card(
+                                        [
+                                            dbc.CardHeader("Simulation History"),
+                                            dbc.CardBody(
+                                                [
+                                                    html.Div(id="history-summary"),
+                                                    html.P(
+                                                        "Total runs: ",
+                                                        className="mb-0 mt-2 font-weight-bold",
+                                                    ),
+                                                    html.Span(
+                                                        id="total-runs", children="0"
+                                                    ),
+                                                    html.P(
+                                                        "Last run: ",
+                                                        className="mb-0 mt-2 font-weight-bold",
+                                                    ),
+                                                    html.Span(
+                                                        id="last-run-time",
+                                                        children="None",
+                                                    ),
+                                                    html.Div(
+                                                        [
+                                                            html.Hr(className="my-2"),
+                                                            html.P(
+                                                                "Model Fit Analysis:",
+                                                                className="mb-0 mt-2 font-weight-bold",
+                                                            ),
+                                                            dbc.Alert(
+                                                                id="best-fit-detail",
+                                                                color="info",
+                                                                className="mt-1 p-2",
+                                                                children="No simulation yet",
+                                                            ),
+                                                        ],
+                                                        className="mt-2",
+                                                    ),
+                                                ]
+                                            ),
+                                        ],
+                                        className="mt-3",
+                                    ),
+                                    # Add the entropy heatmap below Simulation History
+                                    dbc.Card(
+                                        [
+                                            dbc.CardHeader("Entropy Heatmap"),
+                                            dbc.CardBody(
+                                                [
+                                                    html.P(
+                                                        "Heat map shows entropy across parameter space",
+                                                        className="text-muted small mb-2",
+                                                    ),
+                                                    dcc.Graph(
+                                                        id="entropy-heatmap",
+                                                        config={
+                                                            "displayModeBar": False
+                                                        },
+                                                        style={"height": "250px"},
+                                                    ),
+                                                ]
+                                            ),
+                                        ],
+                                        className="mt-3",
+                                    ),
+                                    dbc.Card(
+                                        [
+                                            dbc.CardBody(
+                                                [
+                                                    html.Label(
+                                                        "Max denominator for fraction display:"
+                                                    ),
+                                                    dbc.Row(
+                                                        [
+                                                            dbc.Col(
+                                                                dcc.Slider(
+                                                                    id="max-denominator-slider",
+                                                                    min=2,
+                                                                    max=100,
+                                                                    step=1,
+                                                                    value=30,
+                                                                    marks=DENOMINATOR_MARKS,
+                                                                    tooltip=SLIDER_TOOLTIP,
+                                                                ),
+                                                                width=9,
+                                                            ),
+                                                            dbc.Col(
+                                                                dbc.Input(
+                                                                    id="max-denominator-input",
+                                                                    type="number",
+                                                                    value=30,
+                                                                    min=1,
+                                                                    max=1000,
+                                                                    step=1,
+                                                                    # Send the value once typing pauses rather than on
+                                                                    # every keystroke; each change re-renders the tables
+                                                                    debounce=300,
+                                                                    style=NUMBER_INPUT_STYLE,
+                                                                ),
+                                                                width=3,
+                                                            ),
+                                                        ],
+                                                        className="mb-3 align-items-center",
+                                                    ),
                                                     html.Small(
-                                                        "full=(pmoFDseSdfOMP) and concur=(oFDseSdfO)",
-                                                        className="text-muted d-block mb-3",
-                                                    ),
-                                                    # Run button
-                                                    dbc.Button(
-                                                        "Calculate Full Matrix",
-                                                        id="run-matrix-button",
-                                                        color="primary",
-                                                        size="lg",
-                                                        className="w-100 mt-4",
+                                                        "Higher values give more precise fractions but may be harder to read",
+                                                        className="text-muted d-block mb-2",
                                                     ),
-                                                ],
-                                            ),
-                                        ]
-                                    ),
-                                    # Matrix Results Status Card
-                                    dbc.Card(
-                                        [
-                                            dbc.CardHeader("Matrix Status"),
-                                            dbc.CardBody(
-                                                html.Div(
-                                                    id="matrix-status", className="mt-0"
-                                                )
-                                            ),
-                                        ],
-                                        className="mt-3",
-                                    ),
-                                    # Global Statistics Card (moved from right panel)
-                                    dbc.Card(
-                                        [
-                                            dbc.CardHeader("Global Statistics"),
-                                            dbc.CardBody(
-                                                html.Div(
-                                                    id="matrix-global-stats",
-                                                    className="p-3 rounded",
-                                                    style={
-                                                        "backgroundColor": "#e8f5e9",  # Pale green
-                                                        "border": "1px solid #c8e6c9",
-                                                        "textAlign": "left",
-                                                    },
-                                                )
+                                                ]
                                             ),
                                         ],
                                         className="mt-3 mb-3",
                                     ),
-                                    # Fraction denominator control is removed
                                     dbc.Card(
                                         [
                                             dbc.CardHeader("Load Previous Results"),
@@ -1538,31 +1428,20 @@ app.layout = dbc.Container(
                                                         "Upload previously saved JSON results:"
                                                     ),
                                                     dcc.Upload(
-                                                        id="upload-matrix-json",
+                                                        id="upload-json",
                                                         children=html.Div(
                                                             [
                                                                 "Drag and Drop or ",
                                                                 html.A("Select File"),
                                                             ]
                                                         ),
-                                                        style={
-                                                            "width": "100%",
-                                                            "height": "60px",
-                                                            "lineHeight": "60px",
-                                                            "borderWidth": "1px",
-                                                            "borderStyle": "dashed",
-                                                            "borderRadius": "5px",
-                                                            "textAlign": "center",
-                                                            "margin-bottom": "10px",
-                                                        },
+                                                        style=UPLOAD_STYLE,
                                                         multiple=False,
                                                         accept="application/json",
                                                     ),
-                                                    html.Div(
-                                                        id="upload-matrix-json-status"
-                                                    ),
+                                                    html.Div(id="upload-json-status"),
                                                     html.Small(
-                                                        "Files should be named comp_p[value]_q[value].json",
+                                                        "Files should be named sim_p[value]_q[value].json",
                                                         className="text-muted d-block mt-2",
                                                     ),
                                                 ]
@@ -1572,120 +1451,312 @@ app.layout = dbc.Container(
                                     ),
                                 ],
                                 md=4,
-                                id="matrix-left-panel",
                             ),
                             dbc.Col(
                                 [
                                     dbc.Spinner(
                                         children=[
-                                            # Matrix view card
                                             dbc.Card(
                                                 [
                                                     dbc.CardHeader(
-                                                        html.H5(
-                                                            "Allen Relation Composition Matrix",
-                                                            className="mb-0",
-                                                            id="matrix-title",
-                                                        )
+                                                        "Relation Distribution"
                                                     ),
                                                     dbc.CardBody(
                                                         [
-                                                            # Global Statistics Card removed from here
-                                                            html.P(
-                                                                "The matrix shows the composition of Allen relations R1 (rows) with R2 (columns).",
-                                                                className="text-muted",
+                                                            dbc.Row(
+                                                                [
+                                                                    dbc.Col(
+                                                                        html.Label(
+                                                                            "Show reference models:",
+                                                                            className="font-weight-bold mr-2",
+                                                                        ),
+                                                                        width="auto",
+                                                                    ),
+                                                                    dbc.Col(
+                                                                        dcc.Checklist(
+                                                                            id="model-checklist",
+                                                                            options=[
+                                                                                {
+                                                                                    "label": "Uniform",
+                                                                                    "value": "Uniform",
+                                                                                },
+                                                                                {
+                                                                                    "label": "Fernando-Vogel",
+                                                                                    "value": "Fernando-Vogel",
+                                                                                },
+                                                                                {
+                                                                                    "label": "Suliman",
+                                                                                    "value": "Suliman",
+                                                                                },
+                                                                            ],
+                                                                            value=[],
+                                                                            inline=True,
+                                                                            className="mb-2",
+                                                                            inputStyle={
+                                                                                "margin-right": "5px"
+                                                                            },
+                                                                            labelStyle={
+                                                                                "margin-right": "15px"
+                                                                            },
+                                                                        ),
+                                                                    ),
+                                                                    # Add sorting checkbox
+                                                                    dbc.Col(
+                                                                        dcc.Checklist(
+                                                                            id="sort-checkbox",
+                                                                            options=[
+                                                                                {
+                                                                                    "label": "Sort relations by frequency",
+                                                                                    "value": "sort",
+                                                                                }
+                                                                            ],
+                                                                            value=[],
+                                                                            inline=True,
+                                                                            className="mb-2",
+                                                                            inputStyle={
+                                                                                "margin-right": "5px"
+                                                                            },
+                                                                        ),
+                                                                        width=True,
+                                                                        className="text-right",
+                                                                    ),
+                                                                ],
+                                                                className="mb-3 d-flex align-items-center",
                                                             ),
-                                                            html.P(
+                                                            dcc.Graph(
+                                                                id="relation-chart"
+                                                            ),
+                                                            dbc.Row(
                                                                 [
-                                                                    "Hover over cells to see detailed composition results."
+                                                                    dbc.Col(
+                                                                        html.Div(
+                                                                            id="mode-display",
+                                                                            className="mt-2 text-muted",
+                                                                            style={
+                                                                                "font-size": "0.9rem"
+                                                                            },
+                                                                        ),
+                                                                        width="auto",
+                                                                    ),
+                                                                    dbc.Col(
+                                                                        html.Div(
+                                                                            dbc.Button(
+                                                                                "Export as PNG",
+                                                                                id="export-button",
+                                                                                color="secondary",
+                                                                                className="mt-2",
+                                                                            ),
+                                                                            className="d-flex justify-content-end",
+                                                                        ),
+                                                                        width=True,
+                                                                    ),
                                                                 ],
-                                                                className="text-muted small",
+                                                                className="d-flex justify-content-between align-items-center",
                                                             ),
-                                                            html.Div(
-                                                                dcc.Loading(
-                                                                    id="loading-matrix",
-                                                                    type="default",
-                                                                    children=dcc.Graph(
-                                                                        id="matrix-heatmap",
-                                                                        config={
-                                                                            "responsive": True
-                                                                        },
-                                                                        style={
-                                                                            "height": "700px"
-                                                                        },
+                                                        ]
+                                                    ),
+                                                ],
+                                                className="mb-3",
+                                            ),
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "Entropy"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H3(
+                                                                            id="entropy-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=3,
+                                                    ),
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "Gini Coefficient"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H3(
+                                                                            id="gini-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=3,
+                                                    ),
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "Std Dev"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H3(
+                                                                            id="stddev-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=3,
+                                                    ),
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "Best Fit"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.Div(
+                                                                            id="best-fit-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=3,
+                                                    ),
+                                                ],
+                                                className="mb-3",
+                                            ),
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "JS (Uniform)"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H4(
+                                                                            id="js-uniform-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=4,
+                                                    ),
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "JS (F-V)"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H4(
+                                                                            id="js-fv-value",
+                                                                            className="text-center",
+                                                                        )
+                                                                    ),
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=4,
+                                                    ),
+                                                    dbc.Col(
+                                                        [
+                                                            dbc.Card(
+                                                                [
+                                                                    dbc.CardHeader(
+                                                                        "JS (Suliman)"
+                                                                    ),
+                                                                    dbc.CardBody(
+                                                                        html.H4(
+                                                                            id="js-suliman-value",
+                                                                            className="text-center",
+                                                                        )
                                                                     ),
-                                                                ),
-                                                            ),
-                                                            html.Div(
-                                                                id="cell-details",
-                                                                className="mt-3",
-                                                            ),
-                                                        ]
+                                                                ]
+                                                            )
+                                                        ],
+                                                        md=4,
                                                     ),
-                                                ]
+                                                ],
+                                                className="mb-3",
                                             ),
-                                            # Add the two new visualization cards
                                             dbc.Card(
                                                 [
-                                                    dbc.CardHeader(
-                                                        "Entropy Heatmap of Composition Outcomes"
-                                                    ),
+                                                    dbc.CardHeader("Metrics History"),
                                                     dbc.CardBody(
-                                                        [
-                                                            html.P(
-                                                                "This heatmap shows the entropy (uncertainty) of R3 outcomes for each composition pair.",
-                                                                className="text-muted",
-                                                            ),
-                                                            dcc.Graph(
-                                                                id="entropy-composition-heatmap",
-                                                                config={
-                                                                    "responsive": True
-                                                                },
-                                                                style={
-                                                                    "height": "500px"
-                                                                },
-                                                            ),
-                                                        ]
+                                                        dcc.Graph(id="metrics-chart")
                                                     ),
                                                 ],
-                                                className="mt-4",
+                                                className="mb-3",
                                             ),
                                             dbc.Card(
                                                 [
-                                                    dbc.CardHeader(
-                                                        "Global R3 Distribution"
-                                                    ),
+                                                    dbc.CardHeader("Detailed Results"),
                                                     dbc.CardBody(
-                                                        [
-                                                            html.P(
-                                                                "This chart shows the overall probability of each Allen relation appearing as an R3 outcome across all compositions.",
-                                                                className="text-muted",
-                                                            ),
-                                                            dcc.Graph(
-                                                                id="global-r3-distribution",
-                                                                config={
-                                                                    "responsive": True
+                                                        dash_table.DataTable(
+                                                            id="results-table",
+                                                            columns=[
+                                                                {
+                                                                    "name": "Relation",
+                                                                    "id": "relation",
+                                                                },
+                                                                {
+                                                                    "name": "Name",
+                                                                    "id": "name",
                                                                 },
-                                                                style={
-                                                                    "height": "400px"
+                                                                {
+                                                                    "name": "Count",
+                                                                    "id": "count",
                                                                 },
-                                                            ),
-                                                        ]
+                                                                {
+                                                                    "name": "Probability",
+                                                                    "id": "probability",
+                                                                },
+                                                                {
+                                                                    "name": "≈ Fraction",
+                                                                    "id": "fraction",
+                                                                },
+                                                            ],
+                                                            style_table={
+                                                                "overflowX": "auto"
+                                                            },
+                                                            style_cell={
+                                                                "textAlign": "left",
+                                                                "padding": "8px",
+                                                            },
+                                                            style_header={
+                                                                "backgroundColor": "#f8f9fa",
+                                                                "fontWeight": "bold",
+                                                            },
+                                                            style_data_conditional=[
+                                                                {
+                                                                    "if": {
+                                                                        "state": "selected"
+                                                                    },
+                                                                    "backgroundColor": "#e6f2ff",
+                                                                    "border": "1px solid #ccc",
+                                                                }
+                                                            ],
+                                                        )
                                                     ),
-                                                ],
-                                                className="mt-4",
-                                            ),
-                                            # Add reference tables to right panel, below the matrix
-                                            html.Div(
-                                                [
-                                                    html.Hr(className="mt-4"),
-                                                    get_reference_tables(),
-                                                ],
-                                                className="mt-4",
-                                                style={"width": "100%"},
+                                                ]
                                             ),
                                         ],
-                                        id="matrix-spinner",
+                                        id="loading-spinner",
                                         type="border",
                                         fullscreen=False,
                                         color="primary",
@@ -1695,6 +1766,19 @@ app.layout = dbc.Container(
                             ),
                         ]
                     ),
+                    label="Relation Simulation",  # Renamed from "Distribution Simulator"
+                    tab_id="tab-simulator",
+                    active_label_style={"font-weight": "bold"},
+                ),
+                dbc.Tab(
+                    html.Div(id="tab-composition-body"),
+                    label="Composition Analysis",
+                    tab_id="tab-composition",
+                    active_label_style={"font-weight": "bold"},
+                ),
+                # NEW TAB FOR MATRIX ANALYSIS
+                dbc.Tab(
+                    html.Div(id="tab-matrix-body"),
                     label="Matrix Analysis",  # New third tab
                     tab_id="tab-matrix",
                     active_label_style={"font-weight": "bold"},
@@ -1704,6 +1788,8 @@ app.layout = dbc.Container(
             active_tab="tab-simulator",
         ),
         dcc.Store(id="simulation-results"),
+        # Lazily built tabs that have been activated, in activation order
+        dcc.Store(id="built-tabs", data=[]),
         dcc.Store(
             id="metrics-history",
             data={
@@ -1742,6 +1828,8 @@ app.layout = dbc.Container(
         dcc.Store(id="comp-fraction-denominator", data=30),
         # Add store for matrix fraction denominator (separate from comp)
         dcc.Store(id="matrix-fraction-denominator", data=30),
+        # The clicked matrix cell, copied out of matrix-results in the browser
+        dcc.Store(id="matrix-selected-cell"),
         # Add store for global distribution download
         dcc.Download(id="download-global-dist"),
     ],
@@ -1750,178 +1838,132 @@ app.layout = dbc.Container(
 )
 
 
-# Replace the four separate callbacks with two combined callbacks that avoid the circular dependency
-@app.callback(
-    Output("p-born-slider", "value"),
-    Output("p-born-input", "value"),
-    Output("p-die-slider", "value", allow_duplicate=True),  # Added this output
-    Input("p-born-slider", "value"),
-    Input("p-born-input", "value"),
-    prevent_initial_call=True,
-)
-def sync_born_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "p-born-slider":
-        return slider_value, slider_value, dash.no_update
-    else:
-        return input_value, input_value, dash.no_update
-
-
-@app.callback(
-    Output("p-die-slider", "value"),
-    Output("p-die-input", "value"),
-    Output("p-born-slider", "value", allow_duplicate=True),  # Added this output
-    Input("p-die-slider", "value"),
-    Input("p-die-input", "value"),
-    prevent_initial_call=True,
-)
-def sync_die_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "p-die-slider":
-        return slider_value, slider_value, dash.no_update
-    else:
-        return input_value, input_value, dash.no_update
-
-
-@app.callback(
-    Output("comp-p-born-slider", "value"),
-    Output("comp-p-born-input", "value"),
-    Output("comp-p-die-slider", "value", allow_duplicate=True),  # Added this output
-    Input("comp-p-born-slider", "value"),
-    Input("comp-p-born-input", "value"),
-    prevent_initial_call=True,
-)
-def sync_comp_born_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "comp-p-born-slider":
-        # When slider changes, update both the input and the die slider
-        return dash.no_update, slider_value, slider_value
-    else:
-        # When input changes, only update the born slider
-        return input_value, dash.no_update, dash.no_update
-
-
-@app.callback(
-    Output("comp-p-die-slider", "value"),
-    Output("comp-p-die-input", "value"),
-    Output("comp-p-born-slider", "value", allow_duplicate=True),  # Added this output
-    Input("comp-p-die-slider", "value"),
-    Input("comp-p-die-input", "value"),
+# Tab bodies built on first activation, in the order of build_lazy_tab outputs
+LAZY_TABS = {
+    "tab-composition": composition_tab_body,
+    "tab-matrix": matrix_tab_body,
+}
+
+# Records a lazy tab the first time it is opened; later visits stay in the
+# browser, since the built tab is kept mounted
+app.clientside_callback(
+    """
+    function(activeTab, builtTabs) {
+        const lazyTabs = ["tab-composition", "tab-matrix"];  // LAZY_TABS
+        if (!lazyTabs.includes(activeTab) || builtTabs.includes(activeTab)) {
+            return dash_clientside.no_update;
+        }
+        return builtTabs.concat([activeTab]);
+    }
+    """,
+    Output("built-tabs", "data"),
+    Input("tabs", "active_tab"),
+    State("built-tabs", "data"),
     prevent_initial_call=True,
 )
-def sync_comp_die_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "comp-p-die-slider":
-        # When slider changes, update both the input and the born slider
-        return dash.no_update, slider_value, slider_value
-    else:
-        # When input changes, only update the die slider
-        return input_value, dash.no_update, dash.no_update
 
 
 @app.callback(
-    Output("matrix-p-born-slider", "value"),
-    Output("matrix-p-born-input", "value"),
-    Output("matrix-p-die-slider", "value", allow_duplicate=True),  # Added this output
-    Input("matrix-p-born-slider", "value"),
-    Input("matrix-p-born-input", "value"),
+    [Output(f"{tab_id}-body", "children") for tab_id in LAZY_TABS],
+    Input("built-tabs", "data"),
     prevent_initial_call=True,
 )
-def sync_matrix_born_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
+def build_lazy_tab(built_tabs):
+    # Only the newly opened tab is built; the others keep their contents
+    return [
+        build() if tab_id == built_tabs[-1] else dash.no_update
+        for tab_id, build in LAZY_TABS.items()
+    ]
 
-    if trigger_id == "matrix-p-born-slider":
-        # When slider changes, update both the input and the die slider
-        return dash.no_update, slider_value, slider_value
-    else:
-        # When input changes, only update the born slider
-        return input_value, dash.no_update, dash.no_update
 
+# Slider/input pairs are mirrored in the browser; a drag fires these on every
+# step and no Python is needed to copy a number between two components.
+# The other slider is listed as an output to avoid a circular dependency.
+MIRROR_PAIR_JS = """
+function(sliderValue, inputValue) {
+    const ctx = dash_clientside.callback_context;
+    const fromSlider = ctx.triggered[0].prop_id.endsWith("-slider.value");
+    const value = fromSlider ? sliderValue : inputValue;
+    return [value, value, dash_clientside.no_update];
+}
+"""
 
-@app.callback(
-    Output("matrix-p-die-slider", "value"),
-    Output("matrix-p-die-input", "value"),
-    Output("matrix-p-born-slider", "value", allow_duplicate=True),  # Added this output
-    Input("matrix-p-die-slider", "value"),
-    Input("matrix-p-die-input", "value"),
+app.clientside_callback(
+    MIRROR_PAIR_JS,
+    Output("p-born-slider", "value"),
+    Output("p-born-input", "value"),
+    Output("p-die-slider", "value", allow_duplicate=True),
+    Input("p-born-slider", "value"),
+    Input("p-born-input", "value"),
     prevent_initial_call=True,
 )
-def sync_matrix_die_inputs(slider_value, input_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "matrix-p-die-slider":
-        # When slider changes, update both the input and the born slider
-        return dash.no_update, slider_value, slider_value
-    else:
-        # When input changes, only update the die slider
-        return input_value, dash.no_update, dash.no_update
 
 
-@app.callback(
-    Output("max-denominator-slider", "value"),
-    Output("max-denominator-input", "value"),
-    Output("fraction-denominator", "data"),
-    Input("max-denominator-slider", "value"),
-    Input("max-denominator-input", "value"),
-    State("fraction-denominator", "data"),
+app.clientside_callback(
+    MIRROR_PAIR_JS,
+    Output("p-die-slider", "value"),
+    Output("p-die-input", "value"),
+    Output("p-born-slider", "value", allow_duplicate=True),
+    Input("p-die-slider", "value"),
+    Input("p-die-input", "value"),
     prevent_initial_call=True,
 )
-def sync_max_denominator_inputs(slider_value, input_value, stored_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if trigger_id == "max-denominator-slider":
-        return dash.no_update, slider_value, slider_value
-    else:
-        return input_value, dash.no_update, input_value
-
 
-@app.callback(
-    Output("comp-max-denominator-slider", "value"),
-    Output("comp-max-denominator-input", "value"),
-    Output("comp-fraction-denominator", "data"),
-    Input("comp-max-denominator-slider", "value"),
-    Input("comp-max-denominator-input", "value"),
-    State("comp-fraction-denominator", "data"),
-    prevent_initial_call=True,
-)
-def sync_comp_max_denominator_inputs(slider_value, input_value, stored_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
-    if trigger_id == "comp-max-denominator-slider":
-        return dash.no_update, slider_value, slider_value
-    else:
-        return input_value, dash.no_update, input_value
+# When a slider changes, update its input and the third output; when the
+# input changes, only update its slider
+SYNC_PAIR_JS = """
+function(sliderValue, inputValue) {
+    const noUpdate = dash_clientside.no_update;
+    const ctx = dash_clientside.callback_context;
+    if (ctx.triggered[0].prop_id.endsWith("-slider.value")) {
+        return [noUpdate, sliderValue, sliderValue];
+    }
+    return [inputValue, noUpdate, noUpdate];
+}
+"""
 
+for prefix in ("comp-", "matrix-"):
+    app.clientside_callback(
+        SYNC_PAIR_JS,
+        Output(f"{prefix}p-born-slider", "value"),
+        Output(f"{prefix}p-born-input", "value"),
+        Output(f"{prefix}p-die-slider", "value", allow_duplicate=True),
+        Input(f"{prefix}p-born-slider", "value"),
+        Input(f"{prefix}p-born-input", "value"),
+        prevent_initial_call=True,
+    )
+    app.clientside_callback(
+        SYNC_PAIR_JS,
+        Output(f"{prefix}p-die-slider", "value"),
+        Output(f"{prefix}p-die-input", "value"),
+        Output(f"{prefix}p-born-slider", "value", allow_duplicate=True),
+        Input(f"{prefix}p-die-slider", "value"),
+        Input(f"{prefix}p-die-input", "value"),
+        prevent_initial_call=True,
+    )
 
-@app.callback(
-    Output("matrix-max-denominator-slider", "value"),
-    Output("matrix-max-denominator-input", "value"),
-    Output("matrix-fraction-denominator", "data"),
-    Input("matrix-max-denominator-slider", "value"),
-    Input("matrix-max-denominator-input", "value"),
-    State("matrix-fraction-denominator", "data"),
-    prevent_initial_call=True,
-)
-def sync_matrix_max_denominator_inputs(slider_value, input_value, stored_value):
-    ctx = dash.callback_context
-    trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
-    if trigger_id == "matrix-max-denominator-slider":
-        return dash.no_update, slider_value, slider_value
-    else:
-        return input_value, dash.no_update, input_value
+# The denominator store follows whichever control changed
+for prefix in ("", "comp-", "matrix-"):
+    app.clientside_callback(
+        """
+        function(sliderValue, inputValue) {
+            const noUpdate = dash_clientside.no_update;
+            const ctx = dash_clientside.callback_context;
+            if (ctx.triggered[0].prop_id.endsWith("-slider.value")) {
+                return [noUpdate, sliderValue, sliderValue];
+            }
+            return [inputValue, noUpdate, inputValue];
+        }
+        """,
+        Output(f"{prefix}max-denominator-slider", "value"),
+        Output(f"{prefix}max-denominator-input", "value"),
+        Output(f"{prefix}fraction-denominator", "data"),
+        Input(f"{prefix}max-denominator-slider", "value"),
+        Input(f"{prefix}max-denominator-input", "value"),
+        prevent_initial_call=True,
+    )
 
 
 @app.callback(
@@ -1932,6 +1974,9 @@ def sync_matrix_max_denominator_inputs(slider_value, input_value, stored_value):
     State("p-born-input", "value"),  # Use input field value instead of slider
     State("p-die-input", "value"),  # Use input field value instead of slider
     State("trials-input", "value"),
+    background=background_callback_manager is not None,
+    # Stops repeat clicks queueing runs while one is in progress
+    running=[(Output("run-button", "disabled"), True, False)],
     prevent_initial_call=True,
 )
 def run_simulation(n_clicks, p_born, p_die, trials):
@@ -1944,9 +1989,9 @@ def run_simulation(n_clicks, p_born, p_die, trials):
         key: value / total if total > 0 else 0 for key, value in counts.items()
     }
 
-    js_uniform = js_divergence(distribution, UNIFORM_DISTRIBUTION)
-    js_fv = js_divergence(distribution, FERNANDO_VOGEL_DISTRIBUTION)
-    js_suliman = js_divergence(distribution, SULIMAN_DISTRIBUTION)
+    js_uniform = js_divergence(distribution, UNIFORM_PMF)
+    js_fv = js_divergence(distribution, FERNANDO_VOGEL_PMF)
+    js_suliman = js_divergence(distribution, SULIMAN_PMF)
 
     min_js = min(js_uniform, js_fv, js_suliman)
     if min_js == js_uniform:
@@ -1965,7 +2010,6 @@ def run_simulation(n_clicks, p_born, p_die, trials):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     results = {
-        "distribution": distribution,
         "raw_counts": counts,
         "parameters": {"p_born": p_born, "p_die": p_die, "trials": trials},
         "stats": {
@@ -2002,15 +2046,17 @@ def run_simulation(n_clicks, p_born, p_die, trials):
     Output("mode-display", "children"),
     Output("heatmap-data", "data"),  # Add this output
     Input("simulation-results", "data"),
-    Input("model-checklist", "value"),
-    Input("sort-checkbox", "value"),  # Add sort checkbox input
     Input("fraction-denominator", "data"),  # Add this input
+    # Toggling these only reorders and shows traces, done in the browser by
+    # the callback below; a new result is drawn with the current settings
+    State("model-checklist", "value"),
+    State("sort-checkbox", "value"),
     State("metrics-history", "data"),
     State("heatmap-data", "data"),  # Add this state
     prevent_initial_call=True,
 )
 def update_results(
-    results, selected_models, sort_by, max_denominator, metrics_history, heatmap_data
+    results, max_denominator, selected_models, sort_by, metrics_history, heatmap_data
 ):
     if not results:
         empty_fig = go.Figure()
@@ -2029,7 +2075,8 @@ def update_results(
             "N/A",
             "N/A",
             metrics_history,
-            empty_fig,
+            # Past runs stay charted, so the next run can extend the chart
+            empty_fig if not metrics_history["runs"] else dash.no_update,
             empty_table,
             "0",
             {},
@@ -2038,7 +2085,7 @@ def update_results(
             heatmap_data,  # Return unchanged heatmap data
         )
 
-    distribution = results.get("distribution", {})
+    distribution = results_distribution(results)
     raw_counts = results.get("raw_counts", {})
     parameters = results.get("parameters", {})
     stats = results.get("stats", {})
@@ -2065,19 +2112,13 @@ def update_results(
         f"p={parameters.get('p_born', 0):.2f}, q={parameters.get('p_die', 0):.2f}"
     )
     relation_fig = go.Figure()
-    allen_relations_list = list(ALLEN_RELATIONS)
+    probs = distribution_pmf(distribution)
+    order = display_order(probs, sort_by)
+    allen_relations_list = [ALLEN_RELATIONS[i] for i in order]
 
-    # Sort by frequency if requested
-    if "sort" in sort_by:
-        relation_value_pairs = [
-            (rel, distribution.get(rel, 0)) for rel in allen_relations_list
-        ]
-        relation_value_pairs.sort(key=lambda x: x[1], reverse=True)
-        allen_relations_list = [pair[0] for pair in relation_value_pairs]
-
-    relation_names = [RELATION_NAMES.get(rel, rel) for rel in allen_relations_list]
-    sim_values = [distribution.get(rel, 0) for rel in allen_relations_list]
-    colors = [RELATION_COLORS.get(rel, "#000000") for rel in allen_relations_list]
+    relation_names = [RELATION_NAME_TABLE[i] for i in order]
+    sim_values = probs[order].tolist()
+    colors = [RELATION_COLOR_TABLE[i] for i in order]
 
     mode_relation = stats.get("mode", "")
     mode_name = stats.get("mode_name", "")
@@ -2126,134 +2167,67 @@ def update_results(
             hovertemplate="%{x}: %{y:.4f}<extra></extra>",
         )
     )
-    if "Uniform" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[UNIFORM_DISTRIBUTION.get(rel, 0) for rel in allen_relations_list],
-                mode="lines+markers",
-                name="Uniform",
-                line=dict(color="black", width=2, dash="dash"),
-                marker=dict(size=6, color="black"),
-            )
-        )
-    if "Fernando-Vogel" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[
-                    FERNANDO_VOGEL_DISTRIBUTION.get(rel, 0)
-                    for rel in allen_relations_list
-                ],
-                mode="lines+markers",
-                name="Fernando-Vogel",
-                line=dict(color="black", width=2, dash="dot"),
-                marker=dict(size=6, symbol="diamond", color="black"),
-            )
-        )
-    if "Suliman" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[SULIMAN_DISTRIBUTION.get(rel, 0) for rel in allen_relations_list],
-                mode="lines+markers",
-                name="Suliman",
-                line=dict(color="black", width=2, dash="dashdot"),
-                marker=dict(size=6, symbol="square", color="black"),
-            )
-        )
-    relation_fig.update_layout(
-        title=f"Allen Relation Distribution (p={parameters.get('p_born', 0):.2f}, q={parameters.get('p_die', 0):.2f}, n={parameters.get('trials', 0)})",
-        xaxis_title="Relation Type",
-        yaxis_title="Probability",
-        legend_title="Source",
-        template="plotly_white",
-        transition_duration=500,
-        height=600,
-        yaxis=dict(
-            range=[0, max(max(sim_values) * 1.1, 0.2)],
-        ),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-        xaxis=dict(
-            tickangle=-45,
-        ),
-    )
-    metrics_fig = make_subplots(specs=[[{"secondary_y": True}]])
-    metrics_fig.add_trace(
-        go.Scatter(
-            x=metrics_history["runs"],
-            y=metrics_history["entropy"],
-            mode="lines+markers",
-            name="Entropy",
-            line=dict(color="blue", width=2),
-        ),
-        secondary_y=False,
-    )
-    metrics_fig.add_trace(
-        go.Scatter(
-            x=metrics_history["runs"],
-            y=metrics_history["js_uniform"],
-            mode="lines+markers",
-            name="JS (Uniform)",
-            line=dict(color="green", width=2, dash="dot"),
-            marker=dict(size=6),
-        ),
-        secondary_y=False,
-    )
-    metrics_fig.add_trace(
+    # Every reference model is drawn, hidden unless selected, so the model
+    # checklist can show and hide them without a server round trip
+    relation_fig.add_trace(
         go.Scatter(
-            x=metrics_history["runs"],
-            y=metrics_history["js_fv"],
+            x=relation_names,
+            y=UNIFORM_PMF[order].tolist(),
             mode="lines+markers",
-            name="JS (F-V)",
-            line=dict(color="purple", width=2, dash="dashdot"),
-            marker=dict(size=6),
-        ),
-        secondary_y=False,
+            name="Uniform",
+            line=dict(color="black", width=2, dash="dash"),
+            marker=dict(size=6, color="black"),
+            visible="Uniform" in selected_models,
+        )
     )
-    metrics_fig.add_trace(
+    relation_fig.add_trace(
         go.Scatter(
-            x=metrics_history["runs"],
-            y=metrics_history["js_suliman"],
+            x=relation_names,
+            y=FERNANDO_VOGEL_PMF[order].tolist(),
             mode="lines+markers",
-            name="JS (Suliman)",
-            line=dict(color="orange", width=2, dash="dot"),
-            marker=dict(size=6),
-        ),
-        secondary_y=False,
+            name="Fernando-Vogel",
+            line=dict(color="black", width=2, dash="dot"),
+            marker=dict(size=6, symbol="diamond", color="black"),
+            visible="Fernando-Vogel" in selected_models,
+        )
     )
-    metrics_fig.add_trace(
+    relation_fig.add_trace(
         go.Scatter(
-            x=metrics_history["runs"],
-            y=metrics_history["gini"],
-            mode="lines+markers",
-            name="Gini Coefficient",
-            line=dict(color="red", width=2),
-        ),
-        secondary_y=True,
-    )
-    hover_texts = []
-    for i, params in enumerate(metrics_history["params"]):
-        hover_texts.append(
-            f"Run {i+1}<br>{params}<br>{metrics_history['timestamps'][i]}"
-        )
-    for trace in metrics_fig.data:
-        trace.hovertext = hover_texts
-        trace.hovertemplate = "%{hovertext}<br>%{y:.4f}<extra></extra>"
-    metrics_fig.update_layout(
-        title="Metrics Over Simulation Runs",
-        xaxis_title="Run Number",
+            x=relation_names,
+            y=SULIMAN_PMF[order].tolist(),
+            mode="lines+markers",
+            name="Suliman",
+            line=dict(color="black", width=2, dash="dashdot"),
+            marker=dict(size=6, symbol="square", color="black"),
+            visible="Suliman" in selected_models,
+        )
+    )
+    relation_fig.update_layout(
+        title=f"Allen Relation Distribution (p={parameters.get('p_born', 0):.2f}, q={parameters.get('p_die', 0):.2f}, n={parameters.get('trials', 0)})",
+        xaxis_title="Relation Type",
+        yaxis_title="Probability",
+        legend_title="Source",
         template="plotly_white",
         transition_duration=500,
-        hovermode="closest",
-        height=400,
+        height=600,
+        yaxis=dict(
+            range=[0, max(max(sim_values) * 1.1, 0.2)],
+        ),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+        xaxis=dict(
+            tickangle=-45,
+        ),
     )
-    metrics_fig.update_yaxes(title_text="Entropy / JS Divergence", secondary_y=False)
-    metrics_fig.update_yaxes(title_text="Gini Coefficient", secondary_y=True)
+    # Each update adds one run, so after the first the chart is extended in
+    # place rather than redrawn and resent with the whole history
+    if run_count == 1:
+        metrics_fig = create_metrics_figure(metrics_history)
+    else:
+        metrics_fig = extend_metrics_figure(metrics_history)
     table_data = []
 
     # Check if there are multiple non-zero probabilities
-    show_fractions = sum(1 for v in distribution.values() if v > 0) > 1
+    show_fractions = np.count_nonzero(probs) > 1
 
     for rel in allen_relations_list:
         probability = distribution.get(rel, 0)
@@ -2444,143 +2418,60 @@ def update_results(
     )
 
 
-@app.callback(
+# Model and sort toggles rearrange the drawn chart and table in the browser:
+# traces are put in display order and the reference models shown or hidden,
+# with no server round trip and no new run recorded in the history
+app.clientside_callback(
+    """
+    function(selectedModels, sortBy, figure, tableData) {
+        const noUpdate = dash_clientside.no_update;
+        if (!figure || !figure.data || !figure.data.length || !tableData) {
+            return [noUpdate, noUpdate];
+        }
+        // RELATION_NAME_TABLE, the unsorted display order
+        const order = [
+            "Before", "Meets", "Overlaps", "Finished By", "Contains", "Starts",
+            "Equals", "Started By", "During", "Finishes", "Overlapped By",
+            "Met By", "After"
+        ];
+        const sim = figure.data[0];
+        const prob = {};
+        sim.x.forEach((name, i) => { prob[name] = sim.y[i]; });
+        if ((sortBy || []).includes("sort")) {
+            // Stable, so ties keep their ALLEN_RELATIONS order as in display_order
+            order.sort((a, b) => prob[b] - prob[a]);
+        }
+        const data = figure.data.map((trace, t) => {
+            const index = {};
+            trace.x.forEach((name, i) => { index[name] = i; });
+            const pick = (values) => order.map((name) => values[index[name]]);
+            const updated = Object.assign({}, trace, {x: order, y: pick(trace.y)});
+            if (t === 0) {
+                updated.text = pick(trace.text);
+                updated.marker = Object.assign(
+                    {}, trace.marker, {color: pick(trace.marker.color)}
+                );
+            } else {
+                updated.visible = (selectedModels || []).includes(trace.name);
+            }
+            return updated;
+        });
+        const rows = {};
+        tableData.forEach((row) => { rows[row.name] = row; });
+        return [
+            Object.assign({}, figure, {data: data}),
+            order.map((name) => rows[name]),
+        ];
+    }
+    """,
     Output("relation-chart", "figure", allow_duplicate=True),
-    Output("mode-display", "children", allow_duplicate=True),
+    Output("results-table", "data", allow_duplicate=True),
     Input("model-checklist", "value"),
-    Input("sort-checkbox", "value"),  # Add sort checkbox input
-    State("simulation-results", "data"),
+    Input("sort-checkbox", "value"),
+    State("relation-chart", "figure"),
+    State("results-table", "data"),
     prevent_initial_call=True,
 )
-def update_chart_models(selected_models, sort_by, results):
-    if not results:
-        empty_fig = go.Figure()
-        empty_fig.update_layout(
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-        )
-        return empty_fig, ""
-
-    distribution = results.get("distribution", {})
-    parameters = results.get("parameters", {})
-    stats = results.get("stats", {})
-
-    mode_relation = stats.get("mode", "")
-    mode_name = stats.get("mode_name", "")
-    mode_value = 0
-    mode_color = ""
-    if mode_relation in distribution:
-        mode_value = distribution[mode_relation]
-        mode_color = RELATION_COLORS.get(mode_relation, "#777777")
-
-    mode_display = (
-        html.Div(
-            [
-                html.Span("Mode: ", className="font-weight-bold"),
-                html.Span(
-                    mode_name,
-                    style={
-                        "color": mode_color,
-                        "font-weight": "bold",
-                        "padding": "0 4px",
-                        "border-bottom": f"2px solid {mode_color}",
-                    },
-                ),
-                html.Span(
-                    f" ({format_number(mode_value, digits=3)})",
-                    style={
-                        "color": mode_color,
-                    },
-                ),
-            ],
-            style={"margin-top": "6px"},
-        )
-        if mode_relation
-        else ""
-    )
-
-    allen_relations_list = list(ALLEN_RELATIONS)
-
-    # Sort by frequency if requested
-    if "sort" in sort_by:
-        relation_value_pairs = [
-            (rel, distribution.get(rel, 0)) for rel in allen_relations_list
-        ]
-        relation_value_pairs.sort(key=lambda x: x[1], reverse=True)
-        allen_relations_list = [pair[0] for pair in relation_value_pairs]
-
-    relation_names = [RELATION_NAMES.get(rel, rel) for rel in allen_relations_list]
-    sim_values = [distribution.get(rel, 0) for rel in allen_relations_list]
-    colors = [RELATION_COLORS.get(rel, "#000000") for rel in allen_relations_list]
-
-    relation_fig = go.Figure()
-
-    relation_fig.add_trace(
-        go.Bar(
-            x=relation_names,
-            y=sim_values,
-            name="Simulation",
-            marker_color=colors,
-            text=sim_values,
-            texttemplate="%{y:.3f}",
-            textposition="outside",
-            hovertemplate="%{x}: %{y:.4f}<extra></extra>",
-        )
-    )
-    if "Uniform" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[UNIFORM_DISTRIBUTION.get(rel, 0) for rel in allen_relations_list],
-                mode="lines+markers",
-                name="Uniform",
-                line=dict(color="black", width=2, dash="dash"),
-                marker=dict(size=6, color="black"),
-            )
-        )
-    if "Fernando-Vogel" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[
-                    FERNANDO_VOGEL_DISTRIBUTION.get(rel, 0)
-                    for rel in allen_relations_list
-                ],
-                mode="lines+markers",
-                name="Fernando-Vogel",
-                line=dict(color="black", width=2, dash="dot"),
-                marker=dict(size=6, symbol="diamond", color="black"),
-            )
-        )
-    if "Suliman" in selected_models:
-        relation_fig.add_trace(
-            go.Scatter(
-                x=relation_names,
-                y=[SULIMAN_DISTRIBUTION.get(rel, 0) for rel in allen_relations_list],
-                mode="lines+markers",
-                name="Suliman",
-                line=dict(color="black", width=2, dash="dashdot"),
-                marker=dict(size=6, symbol="square", color="black"),
-            )
-        )
-    relation_fig.update_layout(
-        title=f"Allen Relation Distribution (p={parameters.get('p_born', 0):.2f}, q={parameters.get('p_die', 0):.2f}, n={parameters.get('trials', 0)})",
-        xaxis_title="Relation Type",
-        yaxis_title="Probability",
-        legend_title="Source",
-        template="plotly_white",
-        transition_duration=500,
-        height=600,
-        yaxis=dict(
-            range=[0, max(max(sim_values) * 1.1, 0.2)],
-        ),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-        xaxis=dict(
-            tickangle=-45,
-        ),
-    )
-
-    return relation_fig, mode_display
 
 
 @app.callback(
@@ -2663,15 +2554,18 @@ def export_json(n_clicks, data):
     )
 
 
-@app.callback(
+# Never changes the spinner, so it runs in the browser rather than costing a
+# server round trip on every Run click
+app.clientside_callback(
+    """
+    function(nClicks) {
+        return dash_clientside.no_update;
+    }
+    """,
     Output("loading-spinner", "children"),
     Input("run-button", "n_clicks"),
     prevent_initial_call=True,
 )
-def trigger_spinner(n_clicks):
-    if n_clicks is None:
-        raise dash.exceptions.PreventUpdate
-    return dash.no_update
 
 
 @app.callback(
@@ -2719,33 +2613,27 @@ def update_entropy_heatmap(heatmap_data):
         )
         return fig
 
-    # Extract unique p and q values for the grid
-    unique_p = sorted(list(set([round(p, 2) for p in heatmap_data["p_values"]])))
-    unique_q = sorted(list(set([round(q, 2) for q in heatmap_data["q_values"]])))
-
-    # Create the heatmap data structure
-    heatmap_z = [[None for _ in range(len(unique_p))] for _ in range(len(unique_q))]
-    run_counts_z = [[0 for _ in range(len(unique_p))] for _ in range(len(unique_q))]
-
-    # Populate the grid
-    for i in range(len(heatmap_data["p_values"])):
-        p = heatmap_data["p_values"][i]
-        q = heatmap_data["q_values"][i]
-        entropy_val = heatmap_data["entropy_values"][i]
-        runs = heatmap_data["run_counts"][i]
-
-        # Find indices in the grid
-        p_idx = unique_p.index(round(p, 2))
-        q_idx = unique_q.index(round(q, 2))
-
-        # Set the value
-        heatmap_z[q_idx][p_idx] = entropy_val
-        run_counts_z[q_idx][p_idx] = runs
+    # heatmap-data holds one column per field, so the grid is filled by
+    # indexing whole columns; np.unique gives each point's row and column
+    unique_p, p_idx = np.unique(
+        [round(p, 2) for p in heatmap_data["p_values"]], return_inverse=True
+    )
+    unique_q, q_idx = np.unique(
+        [round(q, 2) for q in heatmap_data["q_values"]], return_inverse=True
+    )
+    # Cells without a run stay NaN and show as gaps; float32 goes out as a
+    # base64 typed array rather than a nested list of decimals
+    entropy_z = np.full((len(unique_q), len(unique_p)), np.nan, dtype=np.float32)
+    entropy_z[q_idx, p_idx] = heatmap_data["entropy_values"]
+    run_counts_z = np.zeros((len(unique_q), len(unique_p)), dtype=np.int64)
+    run_counts_z[q_idx, p_idx] = heatmap_data["run_counts"]
+    unique_p = unique_p.tolist()
+    unique_q = unique_q.tolist()
 
     # Create the heatmap figure
     fig = go.Figure(
         data=go.Heatmap(
-            z=heatmap_z,
+            z=entropy_z,
             x=unique_p,
             y=unique_q,
             colorscale="Viridis",
@@ -2756,22 +2644,14 @@ def update_entropy_heatmap(heatmap_data):
         )
     )
 
-    # Add markers for run counts
-    bubble_sizes = []
-    bubble_x = []
-    bubble_y = []
-    hover_texts = []
-
-    for q_idx, q in enumerate(unique_q):
-        for p_idx, p in enumerate(unique_p):
-            if run_counts_z[q_idx][p_idx] > 0:
-                bubble_x.append(p)
-                bubble_y.append(q)
-                size = min(
-                    run_counts_z[q_idx][p_idx] / 2, 10
-                )  # Scale run count to reasonable size
-                bubble_sizes.append(size)
-                hover_texts.append(f"Runs: {run_counts_z[q_idx][p_idx]}")
+    # Add markers for run counts, in row-major order over the grid
+    q_cells, p_cells = np.nonzero(run_counts_z)
+    runs = run_counts_z[q_cells, p_cells].tolist()
+    bubble_x = [unique_p[i] for i in p_cells]
+    bubble_y = [unique_q[i] for i in q_cells]
+    # Scale run count to reasonable size
+    bubble_sizes = [min(r / 2, 10) for r in runs]
+    hover_texts = [f"Runs: {r}" for r in runs]
 
     # Add scatter plot to show where simulations have been run
     fig.add_trace(
@@ -2841,15 +2721,12 @@ def run_composition(n_clicks, rel1, rel2, p_born, p_die, trials, limit):
         )
         return {}, error_card
 
-    # Generate valid triples with the given parameters
+    # Composition table for these parameters, simulated once per parameter set
     try:
-        triples = generate_valid_triples(p_born, p_die, trials, limit)
-
-        # Build the composition table from the generated triples
-        table = build_composition_table(triples)
+        table, valid_count = simulate_composition_table(p_born, p_die, trials, limit)
 
         # Extract the specific composition we're looking for (rel1 ◦ rel2)
-        composition = table.get(rel1, {}).get(rel2, {})
+        composition = composition_counts(table, rel1, rel2)
 
         # Calculate total count for this composition
         total_count = sum(composition.values())
@@ -2865,7 +2742,7 @@ def run_composition(n_clicks, rel1, rel2, p_born, p_die, trials, limit):
                 "p_die": p_die,
                 "trials": trials,
                 "limit": limit,
-                "valid_count": len(triples),
+                "valid_count": valid_count,
             },
             "composition": {
                 rel: {
@@ -3035,10 +2912,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Relation 1:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"{r1} ({r1_name})"),
                             ]
@@ -3047,10 +2921,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Relation 2:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"{r2} ({r2_name})"),
                             ]
@@ -3059,10 +2930,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Parameters:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"p={p_born}, q={p_die}"),
                             ]
@@ -3071,10 +2939,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Trials:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"{trials} (limit: {limit})"),
                             ]
@@ -3083,10 +2948,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Sample Size:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"{total_count} compositions found"),
                             ]
@@ -3095,10 +2957,7 @@ def update_composition_ui(results, max_denominator):
                             [
                                 html.Td(
                                     html.Strong("Outcomes:"),
-                                    style={
-                                        "paddingRight": "10px",
-                                        "textAlign": "right",
-                                    },
+                                    style=LABEL_CELL_STYLE,
                                 ),
                                 html.Td(f"{outcome_count} possible relation(s)"),
                             ]
@@ -3136,19 +2995,20 @@ def update_composition_ui(results, max_denominator):
     Output("matrix-results", "data"),
     Output("matrix-spinner", "children"),
     Output("matrix-status", "children"),
-    Output(
-        "matrix-global-stats", "children", allow_duplicate=True
-    ),  # Fix callback conflict
     Input("run-matrix-button", "n_clicks"),
     State("matrix-p-born-input", "value"),
     State("matrix-p-die-input", "value"),
     State("matrix-trials-input", "value"),
     State("matrix-limit-input", "value"),
+    # Full-matrix runs are the slowest in the app; like run_simulation they
+    # run in a worker so the other tabs stay responsive meanwhile
+    background=background_callback_manager is not None,
+    running=[(Output("run-matrix-button", "disabled"), True, False)],
     prevent_initial_call=True,
 )
 def run_matrix_calculation(n_clicks, p_born, p_die, trials, limit):
     if n_clicks is None:
-        return None, dash.no_update, dash.no_update, dash.no_update
+        return None, dash.no_update, dash.no_update
 
     # Add validation for input values
     if p_born is None or p_die is None or trials is None or limit is None:
@@ -3156,7 +3016,7 @@ def run_matrix_calculation(n_clicks, p_born, p_die, trials, limit):
             "Error: Please provide valid values for all parameters.",
             color="danger",
         )
-        return None, dash.no_update, error_status, dash.no_update
+        return None, dash.no_update, error_status
 
     try:
         # Calculate the matrix - this may take some time
@@ -3365,10 +3225,7 @@ def run_matrix_calculation(n_clicks, p_born, p_die, trials, limit):
             className="mt-3",
         )
 
-        # Get global stats display
-        global_stats_html = update_matrix_global_stats(data=result)
-
-        return result, matrix_spinner_children, status, global_stats_html
+        return result, matrix_spinner_children, status
 
     except Exception as e:
         # Handle errors
@@ -3399,7 +3256,7 @@ def run_matrix_calculation(n_clicks, p_born, p_die, trials, limit):
             color="danger",
         )
 
-        return None, error_card, error_status, dash.no_update
+        return None, error_card, error_status
 
 
 @app.callback(
@@ -3471,12 +3328,15 @@ def update_matrix_visualization(data):
     # Create figure with custom layout
     fig = go.Figure()
 
-    # Define special relation sets precisely (exact strings for consistent comparison)
-    full_relations_set = set(ALLEN_RELATIONS)  # All 13 relations: pmoFDseSdfOMP
-    concur_relations_set = set("oFDseSdfO")  # The 9 concurrent relations
+    # Define special relation sets precisely, as bitmasks over ALLEN_RELATIONS
+    full_relations_mask = ALL_RELATIONS_MASK  # All 13 relations: pmoFDseSdfOMP
+    concur_relations_mask = rel_mask("oFDseSdfO")  # The 9 concurrent relations
 
-    # Create hover text for each cell and determine cell styling
+    # Create hover text for each cell and determine cell styling. Shapes are
+    # collected and set in one layout update, as add_shape revalidates every
+    # existing shape on each call
     annotations = []
+    shapes = []
 
     for i, r1 in enumerate(y):  # For each row (R1)
         for j, r2 in enumerate(x):  # For each column (R2)
@@ -3507,7 +3367,7 @@ def update_matrix_visualization(data):
 
             # Get list of all relations present in the composition (even with very small percentages)
             # This ensures consistent detection of full and concur patterns
-            present_rels = set(composition.keys())
+            present_rels = rel_mask(composition)
 
             cell_text = ""
             cell_color = "#ffffff"
@@ -3515,74 +3375,60 @@ def update_matrix_visualization(data):
 
             # Check for special cases consistently - exact set matching
             # Full relation set - all 13 Allen relations
-            if present_rels == full_relations_set or "".join(
-                sorted(present_rels)
-            ) == "".join(sorted(ALLEN_RELATIONS)):
+            if present_rels == full_relations_mask:
                 cell_text = "full"
                 cell_color = alspaugh_colors["full"]
                 font_style = "italic"
             # Concurrent relation set - exact match with the 9 concurrent relations
-            elif present_rels == concur_relations_set or "".join(
-                sorted(present_rels)
-            ) == "".join(sorted("oFDseSdfO")):
+            elif present_rels == concur_relations_mask:
                 cell_text = "concur"
                 cell_color = alspaugh_colors["concur"]
                 font_style = "italic"
-            # Also check if we have a parenthetical notation that matches these special cases
-            elif "".join(sorted(present_rels)) == "".join(sorted(ALLEN_RELATIONS)):
-                cell_text = "full"  # Force "full" for any cell with all relations
-                cell_color = alspaugh_colors["full"]
-                font_style = "italic"
-            elif "".join(sorted(present_rels)) == "".join(sorted("oFDseSdfO")):
-                cell_text = "concur"  # Force "concur" for any cell with exactly concurrent relations
-                cell_color = alspaugh_colors["concur"]
-                font_style = "italic"
             else:
-                # Consider only relations with >1% probability for regular cases
-                significant_rels = set(
-                    rel for rel, data in composition.items() if data["percentage"] > 1
+                # Consider only relations with >1% probability for regular cases,
+                # listed in Allen order
+                sorted_rels = mask_rels(
+                    rel_mask(
+                        rel
+                        for rel, data in composition.items()
+                        if data["percentage"] > 1
+                    )
                 )
 
                 # Find dominant relation if one exists (>80%)
-                sorted_rels = sorted(
-                    [(rel, data) for rel, data in composition.items()],
+                dominant_rel, dominant_data = max(
+                    composition.items(),
                     key=lambda x: x[1]["percentage"],
-                    reverse=True,
+                    default=("", {"percentage": 0}),
                 )
-
-                dominant_rel = sorted_rels[0][0] if sorted_rels else ""
-                dominant_pct = sorted_rels[0][1]["percentage"] if sorted_rels else 0
+                dominant_pct = dominant_data["percentage"]
 
                 if dominant_pct > 80:
                     # Single dominant relation
                     cell_text = dominant_rel
                     cell_color = alspaugh_colors.get(dominant_rel, "#ffffff")
-                elif len(significant_rels) <= 5:
+                elif len(sorted_rels) <= 5:
                     # Small set of relations - show them all in Allen order
-                    sorted_rels = [
-                        rel for rel in ALLEN_RELATIONS if rel in significant_rels
-                    ]
                     cell_text = "".join(sorted_rels)
                     # Try to find matching color in Alspaugh's scheme
                     cell_color = alspaugh_colors.get(cell_text, "#f5f5f5")
                 else:
                     # Many relations - use abbreviated notation
-                    sorted_rels = [
-                        rel for rel in ALLEN_RELATIONS if rel in significant_rels
-                    ]
                     cell_text = "(" + "".join(sorted_rels) + ")"
                     cell_color = "#f0f0f0"
 
             # Add cell with proper background
-            fig.add_shape(
-                type="rect",
-                x0=j - 0.5,
-                y0=i - 0.5,
-                x1=j + 0.5,
-                y1=i + 0.5,
-                line=dict(color="#eeeeee", width=0.5),  # Very light gray lines
-                fillcolor=cell_color,
-                layer="below",
+            shapes.append(
+                dict(
+                    type="rect",
+                    x0=j - 0.5,
+                    y0=i - 0.5,
+                    x1=j + 0.5,
+                    y1=i + 0.5,
+                    line=dict(color="#eeeeee", width=0.5),  # Very light gray lines
+                    fillcolor=cell_color,
+                    layer="below",
+                )
             )
 
             # Add text annotation with black text
@@ -3623,8 +3469,9 @@ def update_matrix_visualization(data):
         tickfont=dict(size=12),
     )
 
-    # Add the annotations
+    # Add the cell shapes and annotations
     fig.update_layout(
+        shapes=shapes,
         annotations=annotations,
         title=f"Allen Relation Composition Matrix (p={params.get('p_born', 0):.2f}, q={params.get('p_die', 0):.2f})",
         height=700,
@@ -3638,28 +3485,44 @@ def update_matrix_visualization(data):
     return fig
 
 
-@app.callback(
-    Output("cell-details", "children"),
+# Only the clicked cell is sent on to display_cell_details, rather than the
+# whole matrix store on every click
+app.clientside_callback(
+    """
+    function(clickData, matrixResults) {
+        if (!clickData || !matrixResults) {
+            return dash_clientside.no_update;
+        }
+        const point = (clickData.points || [{}])[0];
+        const r2 = point.x;
+        const r1 = point.y;
+        if (!r1 || !r2) {
+            return null;
+        }
+        const row = (matrixResults.matrix || {})[r1] || {};
+        return {r1: r1, r2: r2, cell: row[r2] || {composition: {}, total: 0}};
+    }
+    """,
+    Output("matrix-selected-cell", "data"),
     Input("matrix-heatmap", "clickData"),
-    Input("matrix-fraction-denominator", "data"),
-    State("matrix-results", "data"),
+    Input("matrix-results", "data"),
     prevent_initial_call=True,
 )
-def display_cell_details(click_data, max_denominator, matrix_results):
-    if not click_data or not matrix_results:
-        return ""
 
-    # Extract clicked cell information
-    points = click_data.get("points", [{}])[0]
-    x_val = points.get("x")  # R2
-    y_val = points.get("y")  # R1
 
-    if not x_val or not y_val:
+@app.callback(
+    Output("cell-details", "children"),
+    Input("matrix-selected-cell", "data"),
+    Input("matrix-fraction-denominator", "data"),
+    prevent_initial_call=True,
+)
+def display_cell_details(selected_cell, max_denominator):
+    if not selected_cell:
         return ""
 
-    # Get the cell data
-    matrix = matrix_results.get("matrix", {})
-    cell_data = matrix.get(y_val, {}).get(x_val, {"composition": {}, "total": 0})
+    x_val = selected_cell["r2"]
+    y_val = selected_cell["r1"]
+    cell_data = selected_cell["cell"]
     composition = cell_data.get("composition", {})
     total = cell_data.get("total", 0)
 
@@ -3766,33 +3629,6 @@ def display_cell_details(click_data, max_denominator, matrix_results):
     )
 
 
-@app.callback(
-    Output("single-composition-container", "style", allow_duplicate=True),
-    Output("matrix-composition-container", "style", allow_duplicate=True),
-    Output("valid-relations-container", "style"),
-    Output("most-common-container", "style"),
-    Input("composition-mode-tabs", "active_tab"),
-    prevent_initial_call=True,
-)
-def toggle_composition_view(active_tab):
-    if active_tab == "tab-single-comp":
-        # Show single composition, hide matrix, show stats
-        return (
-            {"display": "block"},
-            {"display": "none"},
-            {"display": "block"},
-            {"display": "block"},
-        )
-    else:  # tab-full-matrix
-        # Hide single composition, show matrix, hide stats
-        return (
-            {"display": "none"},
-            {"display": "block"},
-            {"display": "none"},
-            {"display": "none"},
-        )
-
-
 @app.callback(
     Output("matrix-global-stats", "children"),
     Input("matrix-results", "data"),
@@ -4016,54 +3852,39 @@ def update_entropy_heatmap(data):
         reversed(ALLEN_RELATIONS)
     )  # Rows (R1) - reversed to match traditional visualization
 
-    # Initialize the z-values (entropy) and hover text matrices
-    z = []
-    hover_text = []
-
-    for r1 in y:
-        entropy_row = []
-        hover_row = []
-        for r2 in x:
-            cell_data = matrix.get(r1, {}).get(r2, {"composition": {}, "total": 0})
-            composition = cell_data.get("composition", {})
-            total = cell_data.get("total", 0)
-
-            # Calculate entropy if we have data
-            if total > 0:
-                distribution = {
-                    rel: data["percentage"] / 100 for rel, data in composition.items()
-                }
-                entropy_val = entropy(distribution)
-
-                # Find most probable outcome
-                most_probable = None
-                max_prob = 0
-                for rel, data in composition.items():
-                    if data["percentage"] > max_prob:
-                        most_probable = rel
-                        max_prob = data["percentage"]
-
-                # Format hover text with detailed information
-                hover_info = (
-                    f"R1: {r1} ({RELATION_NAMES.get(r1, 'Unknown')})<br>"
-                    + f"R2: {r2} ({RELATION_NAMES.get(r2, 'Unknown')})<br>"
-                    + f"Entropy: {entropy_val:.4f}<br>"
-                    + f"Most probable: {most_probable} ({RELATION_NAMES.get(most_probable, 'Unknown')})<br>"
-                    + f"Probability: {max_prob:.2f}%"
-                )
-            else:
-                entropy_val = None
-                hover_info = (
-                    f"R1: {r1} ({RELATION_NAMES.get(r1, 'Unknown')})<br>"
-                    + f"R2: {r2} ({RELATION_NAMES.get(r2, 'Unknown')})<br>"
-                    + "No data"
-                )
-
-            entropy_row.append(entropy_val)
-            hover_row.append(hover_info)
+    # Per-cell totals, entropy and most probable outcome, rows in display order
+    counts = matrix_counts(matrix)[::-1]
+    totals = counts.sum(axis=2)
+    entropies = entropy_matrix(counts)
+    modes = counts.argmax(axis=2)
+    max_pcts = counts.max(axis=2) / np.maximum(totals, 1) * 100
+
+    row_labels = [f"R1: {r1} ({RELATION_NAMES.get(r1, 'Unknown')})<br>" for r1 in y]
+    col_labels = [f"R2: {r2} ({RELATION_NAMES.get(r2, 'Unknown')})<br>" for r2 in x]
+    mode_labels = [
+        f"Most probable: {rel} ({RELATION_NAMES.get(rel, 'Unknown')})<br>"
+        for rel in ALLEN_RELATIONS
+    ]
 
-        z.append(entropy_row)
-        hover_text.append(hover_row)
+    # Initialize the z-values (entropy) and hover text matrices. float32 is
+    # ample for colouring and ships as a compact typed array; NaN marks cells
+    # without data
+    z = np.where(totals > 0, entropies, np.nan).astype(np.float32)
+    hover_text = [
+        [
+            (
+                row_label
+                + col_label
+                + f"Entropy: {entropies[i, j]:.4f}<br>"
+                + mode_labels[modes[i, j]]
+                + f"Probability: {max_pcts[i, j]:.2f}%"
+                if totals[i, j] > 0
+                else row_label + col_label + "No data"
+            )
+            for j, col_label in enumerate(col_labels)
+        ]
+        for i, row_label in enumerate(row_labels)
+    ]
 
     # Create the heatmap figure
     fig = go.Figure(
@@ -4165,10 +3986,10 @@ def update_global_r3_distribution(data):
 
     # Use standard ALLEN_RELATIONS order instead of sorting by frequency
     relation_codes = list(ALLEN_RELATIONS)
-    relation_names = [RELATION_NAMES.get(rel, rel) for rel in relation_codes]
+    relation_names = list(RELATION_NAME_TABLE)
     probabilities = [distribution.get(rel, 0) * 100 for rel in relation_codes]
     counts = [raw_counts.get(rel, 0) for rel in relation_codes]
-    colors = [RELATION_COLORS.get(rel, "#000000") for rel in relation_codes]
+    colors = list(RELATION_COLOR_TABLE)
 
     # Create the bar chart
     fig = go.Figure()
@@ -4251,7 +4072,9 @@ def process_uploaded_json(contents, filename):
         data = json.loads(decoded.decode("utf-8"))
 
         # Check if this is a simulation file
-        is_sim_file = filename.startswith("sim_") or "results" in data
+        is_sim_file = (
+            filename.startswith("sim_") or "entries" in data or "results" in data
+        )
 
         if not is_sim_file:
             return (
@@ -4279,7 +4102,7 @@ def process_uploaded_json(contents, filename):
             p_die = float(match.group(2))
 
         # Handle the nested structure from sim_px_qy.json files
-        if "results" in data:
+        if "entries" in data or "results" in data:
             metadata = data.get("metadata", {})
             p_born = metadata.get("pBorn", p_born)
             p_die = metadata.get("pDie", p_die)
@@ -4288,9 +4111,11 @@ def process_uploaded_json(contents, filename):
                 "timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             )
 
-            # Get the first result
-            result_key = next(iter(data["results"]))
-            result = data["results"][result_key]
+            # Get the first result (legacy files key results by "p_q" strings)
+            if "entries" in data:
+                result = data["entries"][0]
+            else:
+                result = next(iter(data["results"].values()))
 
             if isinstance(result, dict) and "counts" in result:
                 counts = result.get("counts", {})
@@ -4350,7 +4175,7 @@ def process_uploaded_json(contents, filename):
         return (
             dash.no_update,
             dbc.Alert(
-                "File has an unrecognized format. Expected simulation data with 'results'.",
+                "File has an unrecognized format. Expected simulation data with 'entries'.",
                 color="warning",
                 dismissable=True,
                 duration=4000,
@@ -4376,125 +4201,6 @@ def process_uploaded_json(contents, filename):
         )
 
 
-# Add a new upload component for composition tab
-dbc.Card(
-    [
-        dbc.CardHeader("Load Previous Results"),
-        dbc.CardBody(
-            [
-                html.P("Upload previously saved JSON results:"),
-                dcc.Upload(
-                    id="upload-comp-json",
-                    children=html.Div(
-                        [
-                            "Drag and Drop or ",
-                            html.A("Select File"),
-                        ]
-                    ),
-                    style={
-                        "width": "100%",
-                        "height": "60px",
-                        "lineHeight": "60px",
-                        "borderWidth": "1px",
-                        "borderStyle": "dashed",
-                        "borderRadius": "5px",
-                        "textAlign": "center",
-                        "margin-bottom": "10px",
-                    },
-                    multiple=False,
-                    accept="application/json",
-                ),
-                html.Div(id="upload-comp-json-status"),
-                html.Small(
-                    "Files should be named comp_p[value]_q[value].json",
-                    className="text-muted d-block mt-2",
-                ),
-            ]
-        ),
-    ],
-    className="mt-3 mb-3",
-),
-
-# Add a new upload component for matrix tab
-dbc.Card(
-    [
-        dbc.CardHeader("Load Previous Results"),
-        dbc.CardBody(
-            [
-                html.P("Upload previously saved JSON results:"),
-                dcc.Upload(
-                    id="upload-matrix-json",
-                    children=html.Div(
-                        [
-                            "Drag and Drop or ",
-                            html.A("Select File"),
-                        ]
-                    ),
-                    style={
-                        "width": "100%",
-                        "height": "60px",
-                        "lineHeight": "60px",
-                        "borderWidth": "1px",
-                        "borderStyle": "dashed",
-                        "borderRadius": "5px",
-                        "textAlign": "center",
-                        "margin-bottom": "10px",
-                    },
-                    multiple=False,
-                    accept="application/json",
-                ),
-                html.Div(id="upload-matrix-json-status"),
-                html.Small(
-                    "Files should be named matrix_p[value]_q[value].json",
-                    className="text-muted d-block mt-2",
-                ),
-            ]
-        ),
-    ],
-    className="mt-3 mb-3",
-),
-
-
-# Add a new upload component for matrix tab
-dbc.Card(
-    [
-        dbc.CardHeader("Load Previous Results"),
-        dbc.CardBody(
-            [
-                html.P("Upload previously saved JSON results:"),
-                dcc.Upload(
-                    id="upload-matrix-json",
-                    children=html.Div(
-                        [
-                            "Drag and Drop or ",
-                            html.A("Select File"),
-                        ]
-                    ),
-                    style={
-                        "width": "100%",
-                        "height": "60px",
-                        "lineHeight": "60px",
-                        "borderWidth": "1px",
-                        "borderStyle": "dashed",
-                        "borderRadius": "5px",
-                        "textAlign": "center",
-                        "margin-bottom": "10px",
-                    },
-                    multiple=False,
-                    accept="application/json",
-                ),
-                html.Div(id="upload-matrix-json-status"),
-                html.Small(
-                    "Files should be named comp_p[value]_q[value].json",
-                    className="text-muted d-block mt-2",
-                ),
-            ]
-        ),
-    ],
-    className="mt-3 mb-3",
-),
-
-
 # Add a callback for the composition tab JSON upload
 @app.callback(
     Output("composition-results", "data", allow_duplicate=True),
@@ -4566,9 +4272,9 @@ def process_uploaded_comp_json(contents, filename):
 
         if "compositions" in data:
             # Find the first non-empty composition
-            for rel1 in data["compositions"]:
-                for rel2 in data["compositions"][rel1]:
-                    if data["compositions"][rel1][rel2]:
+            for rel1, row in data["compositions"].items():
+                for rel2, cell in row.items():
+                    if cell:
                         r1 = rel1
                         r2 = rel2
                         break
@@ -4730,13 +4436,11 @@ def process_uploaded_matrix_json(contents, filename):
             total_compositions = 0
 
             # Process each composition pair
-            for r1 in compositions:
-                if r1 not in matrix_data["matrix"]:
-                    matrix_data["matrix"][r1] = {}
-
-                for r2 in compositions[r1]:
-                    comp_data = compositions[r1][r2]
+            matrix = matrix_data["matrix"]
+            for r1, row in compositions.items():
+                matrix_row = matrix.setdefault(r1, {})
 
+                for r2, comp_data in row.items():
                     # Skip "unobserved" compositions
                     if comp_data == "unobserved":
                         continue
@@ -4759,7 +4463,7 @@ def process_uploaded_matrix_json(contents, filename):
                             global_counts[r3] = 0
                         global_counts[r3] += details["count"]
 
-                    matrix_data["matrix"][r1][r2] = cell_data
+                    matrix_row[r2] = cell_data
 
             # Add global statistics
             if total_compositions > 0:
@@ -4769,16 +4473,15 @@ def process_uploaded_matrix_json(contents, filename):
                 }
 
                 # Calculate entropy and gini for the global distribution
-                dist_values = list(distribution.values())
                 matrix_data["global_stats"] = {
                     "distribution": distribution,
                     "raw_counts": global_counts,
-                    "entropy": entropy(dist_values),
+                    "entropy": entropy(distribution),
                     "gini": gini(distribution),
                     # Calculate JS divergences
-                    "js_uniform": js_divergence(distribution, UNIFORM_DISTRIBUTION),
-                    "js_fv": js_divergence(distribution, FERNANDO_VOGEL_DISTRIBUTION),
-                    "js_suliman": js_divergence(distribution, SULIMAN_DISTRIBUTION),
+                    "js_uniform": js_divergence(distribution, UNIFORM_PMF),
+                    "js_fv": js_divergence(distribution, FERNANDO_VOGEL_PMF),
+                    "js_suliman": js_divergence(distribution, SULIMAN_PMF),
                 }
 
                 # Determine best fit model
@@ -4827,15 +4530,10 @@ def process_uploaded_matrix_json(contents, filename):
                             str(i): prob for i, prob in enumerate(dist)
                         }
 
-                    # Replace the list with the dictionary
+                    # Replace the list with the dictionary. Relabelling leaves
+                    # the values unchanged, so the stored entropy and gini stand
                     data["global_stats"]["distribution"] = distribution_dict
 
-                    # Recalculate entropy and gini with the dictionary values
-                    data["global_stats"]["entropy"] = entropy(
-                        list(distribution_dict.values())
-                    )
-                    data["global_stats"]["gini"] = gini(distribution_dict)
-
         # Create success message with details about the loaded data
         file_type = "matrix" if is_matrix_file else "composition"
         success_message = dbc.Alert(
@@ -4871,57 +4569,17 @@ def process_uploaded_matrix_json(contents, filename):
         )
 
 
-# Update the existing upload component in Simulation tab to include help text
-dbc.Card(
-    [
-        dbc.CardHeader("Load Previous Results"),
-        dbc.CardBody(
-            [
-                html.P("Upload previously saved JSON results:"),
-                dcc.Upload(
-                    id="upload-json",
-                    children=html.Div(
-                        [
-                            "Drag and Drop or ",
-                            html.A("Select File"),
-                        ]
-                    ),
-                    style={
-                        "width": "100%",
-                        "height": "60px",
-                        "lineHeight": "60px",
-                        "borderWidth": "1px",
-                        "borderStyle": "dashed",
-                        "borderRadius": "5px",
-                        "textAlign": "center",
-                        "margin-bottom": "10px",
-                    },
-                    multiple=False,
-                    accept="application/json",
-                ),
-                html.Div(id="upload-json-status"),
-                html.Small(
-                    "Files should be named sim_p[value]_q[value].json",
-                    className="text-muted d-block mt-2",
-                ),
-            ]
-        ),
-    ],
-    className="mt-3 mb-3",
-),
-
-
-# Add a callback to update matrix visualization from loaded data
+# Add a callback to update matrix visualization from loaded data. The global
+# stats panel is rendered once, by update_matrix_global_stats
 @app.callback(
     Output("matrix-status", "children", allow_duplicate=True),
-    Output("matrix-global-stats", "children", allow_duplicate=True),
     Input("matrix-results", "data"),
     prevent_initial_call=True,
 )
 def update_matrix_status_from_upload(data):
     """Update the matrix status when data is loaded from a file"""
     if not data or not isinstance(data, dict):
-        return dash.no_update, dash.no_update
+        return dash.no_update
 
     # Create a status card showing the data has been loaded
     status = html.Div(
@@ -4961,14 +4619,7 @@ def update_matrix_status_from_upload(data):
         ]
     )
 
-    # Update global stats if available
-    if "global_stats" in data:
-        global_stats = update_matrix_global_stats(data)
-        return status, global_stats
-
-    # Return placeholder if no global stats
-    placeholder_stats = html.Div("Global statistics not available in the loaded file")
-    return status, placeholder_stats
+    return status
 
 
 app.index_string = """
@@ -1,16 +1,20 @@
 import argparse
 import json
-import math
-import random
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
 from tqdm import tqdm
 
 import constants as c
-from simulations import arSimulate
-from stats import describe_global
+from stats import describe_global_multi
+
+# Prefer the ahead-of-time build (python _simcc.py), else JIT on first call
+try:
+    from allen_sim import ar_simulate_batch
+except ImportError:
+    from _simcc import ar_simulate_batch
 
 DEFAULT_TRIALS = 1000
 DEFAULT_OUTPUT = "sim_results.json"
@@ -18,19 +22,22 @@ DEFAULT_OUTPUT = "sim_results.json"
 
 class InfEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, float) and not math.isfinite():
-            return "Infinity" if obj > 0 else "-Infinity"
-        elif isinstance(obj, timedelta):
+        if isinstance(obj, timedelta):
             return str(obj)
         return super().default(obj)
 
 
 def collect_stats(counts):
-    refs = {
-        "Uniform": describe_global(counts, c.UNIFORM_DISTRIBUTION),
-        "Suliman": describe_global(counts, c.SULIMAN_DISTRIBUTION, smooth=True),
-        "F-V": describe_global(counts, c.FERNANDO_VOGEL_DISTRIBUTION, smooth=True),
-    }
+    summary = describe_global_multi(
+        counts,
+        {
+            "Uniform": c.UNIFORM_PMF,
+            "Suliman": c.SULIMAN_PMF,
+            "F-V": c.FERNANDO_VOGEL_PMF,
+        },
+        smooth=("Suliman", "F-V"),
+    )
+    refs = summary["compare"]
 
     best_fit = min(
         (
@@ -44,7 +51,6 @@ def collect_stats(counts):
 
     metrics = ["chi_square_theory", "kl_divergence", "js_divergence"]
     labels = ["chi2_p", "kl", "js"]
-    summary = refs["Uniform"]
 
     return {
         "best_fit": best_fit,
@@ -71,23 +77,24 @@ def collect_stats(counts):
 
 
 def run_batch(trials, pBorn, pDie, short=False, quiet=False, seed=None):
-    if seed is not None:
-        random.seed(seed)
-        if not quiet:
-            print(f"Using random seed: {seed}")
+    if seed is not None and not quiet:
+        print(f"Using random seed: {seed}")
 
     start = time.time()
     timestamp = datetime.now().isoformat(timespec="seconds")
-    results = {}
+    entries = []
 
     if not quiet:
         print(f"Simulating with pBorn={pBorn}, pDie={pDie}, trials={trials}")
 
-    counts = arSimulate(pBorn, pDie, trials)
-    result = {"p": pBorn, "q": pDie, "stats": collect_stats(counts)}
+    row = ar_simulate_batch(
+        np.array([pBorn]), np.array([pDie]), trials, -1 if seed is None else seed
+    )[0]
+    counts = dict(zip(c.ALLEN_RELATIONS, row.tolist()))
+    entry = {"i": 0, "j": 0, "p": pBorn, "q": pDie, "stats": collect_stats(counts)}
     if not short:
-        result["counts"] = {rel: counts.get(rel, 0) for rel in c.ALLEN_RELATIONS}
-    results[f"{pBorn:.6f}_{pDie:.6f}"] = result
+        entry["counts"] = {rel: counts.get(rel, 0) for rel in c.ALLEN_RELATIONS}
+    entries.append(entry)
 
     duration = timedelta(seconds=int(time.time() - start))
     metadata = {
@@ -96,10 +103,11 @@ def run_batch(trials, pBorn, pDie, short=False, quiet=False, seed=None):
         "trials": trials,
         "pBorn": pBorn,
         "pDie": pDie,
+        "seed": seed,
         "runs": 1,
     }
 
-    return results, metadata
+    return entries, metadata
 
 
 def main():
@@ -138,13 +146,18 @@ def main():
         )
         print(f"Output: {out_path}")
 
-    results, metadata = run_batch(
+    entries, metadata = run_batch(
         args.trials, args.pBorn, args.pDie, args.short, args.quiet, args.seed
     )
 
     with out_path.open("w") as f:
         json.dump(
-            {"metadata": metadata, "results": results},
+            {
+                "metadata": metadata,
+                "p_values": [args.pBorn],
+                "q_values": [args.pDie],
+                "entries": entries,
+            },
             f,
             indent=2,
             cls=InfEncoder,
@@ -4,32 +4,24 @@ from pathlib import Path
 from constants import (
     ALLEN_RELATIONS,
     RELATION_NAMES,
-    UNIFORM_DISTRIBUTION,
-    FERNANDO_VOGEL_DISTRIBUTION,
-    SULIMAN_DISTRIBUTION,
+    UNIFORM_PMF,
+    FERNANDO_VOGEL_PMF,
+    SULIMAN_PMF,
 )
 from stats import entropy, gini, js_divergence
+from formatting import format_number
 
 DEFAULT_INPUT, DEFAULT_OUTPUT = "comp_results.json", "COMP_RESULTS.md"
 
-
-def format_number(val, digits=4):
-    if val is None:
-        return "N/A"
-    if isinstance(val, float):
-        if math.isnan(val):
-            return "NaN"
-        if math.isinf(val):
-            return "∞" if val > 0 else "-∞"
-        return f"{val:.{digits}f}"
-    return str(val)
+_FMT2 = "{:.2f}".format
 
 
 def format_percentage(val, digits=2):
     if val is None:
         return "N/A"
     if isinstance(val, float):
-        result = f"{val:.{digits}f}".rstrip("0").rstrip(".")
+        result = (_FMT2(val) if digits == 2 else f"{val:.{digits}f}").rstrip("0")
+        result = result.rstrip(".")
         return result or "0"
     return str(val)
 
@@ -51,8 +43,10 @@ def get_missing_compositions(comp):
 
 
 def percentage_to_fraction(percentage):
-    if percentage == 100:
+    if math.isclose(percentage, 100.0, abs_tol=1e-9):
         return "1"
+    if percentage <= 0:
+        return "0"
     decimal = percentage / 100
     frac = Fraction(decimal).limit_denominator(30)
     if frac.denominator == 1:
@@ -95,9 +89,9 @@ def calculate_global_stats(comp):
     global_coverage = sum(1 for val in global_distribution.values() if val > 0)
 
     # Calculate JS divergence against theoretical models
-    js_uniform = js_divergence(global_distribution, UNIFORM_DISTRIBUTION)
-    js_fv = js_divergence(global_distribution, FERNANDO_VOGEL_DISTRIBUTION)
-    js_suliman = js_divergence(global_distribution, SULIMAN_DISTRIBUTION)
+    js_uniform = js_divergence(global_distribution, UNIFORM_PMF)
+    js_fv = js_divergence(global_distribution, FERNANDO_VOGEL_PMF)
+    js_suliman = js_divergence(global_distribution, SULIMAN_PMF)
 
     # Determine best fit model
     min_js = min(js_uniform, js_fv, js_suliman)
@@ -162,7 +156,7 @@ def generate_composition_report(data, output_path):
             "</details>",
         ]
 
-    lines = [
+    header = [
         "# Composition Results",
         f"- **Generated:** `{meta}`",
         f"- **Duration:** `{duration}`",
@@ -174,10 +168,10 @@ def generate_composition_report(data, output_path):
     ]
 
     if missing_section:
-        lines.extend(missing_section)
+        header.extend(missing_section)
 
     # Add global statistics section
-    lines.extend(
+    header.extend(
         [
             "\n## Global R3 Distribution Statistics",
             "*Aggregated across all R1•R2 composition pairs*",
@@ -210,67 +204,68 @@ def generate_composition_report(data, output_path):
         reverse=True,
     )
 
-    for rel, prob, count in sorted_relations:
-        name = RELATION_NAMES.get(rel, "Unknown")
-        lines.append(
-            f"| {rel} | {name} | {format_int(count)} | {format_percentage(prob * 100)}% |"
-        )
-
-    lines.extend(
-        [
-            "\n---\n",
-            "## Composition Table",
-            "<sub>Only showing compositions with multiple outcomes. Fractions are limited to denominators `≤ 30`.</sub>",
-            "| r1 | r2 | Total | r3 Outcomes (rel → %) | ≈ Fractions |",
-            "|----|----|-------|-----------------------|-------------|",
-        ]
-    )
-
     # Track the number of filtered rows
     total_compositions = 0
     multiple_outcome_compositions = 0
 
-    for r1 in ALLEN_RELATIONS:
-        if r1 not in comp:
-            continue
-        for r2 in ALLEN_RELATIONS:
-            if r2 not in comp[r1]:
-                continue
-            cell = comp[r1][r2]
-            if cell == "unobserved":
-                continue
+    with output_path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        w = f.write
+        w("\n".join(header))
 
-            total_compositions += 1
-            total = sum(item["count"] for item in cell.values())
+        for rel, prob, count in sorted_relations:
+            name = RELATION_NAMES.get(rel, "Unknown")
+            w(
+                f"\n| {rel} | {name} | {format_int(count)} | {format_percentage(prob * 100)}% |"
+            )
 
-            outcome_items = [
-                (r3, cell[r3]["percentage"]) for r3 in ALLEN_RELATIONS if r3 in cell
-            ]
+        w(
+            "\n\n---\n"
+            "\n## Composition Table"
+            "\n<sub>Only showing compositions with multiple outcomes. Fractions are limited to denominators `≤ 30`.</sub>"
+            "\n| r1 | r2 | Total | r3 Outcomes (rel → %) | ≈ Fractions |"
+            "\n|----|----|-------|-----------------------|-------------|"
+        )
 
-            # Skip rows with a single outcome (100% probability)
-            if len(outcome_items) <= 1:
+        for r1 in ALLEN_RELATIONS:
+            if r1 not in comp:
                 continue
+            for r2 in ALLEN_RELATIONS:
+                if r2 not in comp[r1]:
+                    continue
+                cell = comp[r1][r2]
+                if cell == "unobserved":
+                    continue
 
-            multiple_outcome_compositions += 1
+                total_compositions += 1
+                total = sum(item["count"] for item in cell.values())
 
-            outcomes = ", ".join(
-                f"{r3} ({format_percentage(pct)}%)" for r3, pct in outcome_items
-            )
+                outcome_items = [
+                    (r3, cell[r3]["percentage"]) for r3 in ALLEN_RELATIONS if r3 in cell
+                ]
 
-            fraction_cell = ", ".join(
-                percentage_to_fraction(pct) for _, pct in outcome_items
-            )
+                # Skip rows with a single outcome (100% probability)
+                if len(outcome_items) <= 1:
+                    continue
 
-            lines.append(
-                f"| {r1} | {r2} | {format_int(total)} | {outcomes} | {fraction_cell} |"
-            )
+                multiple_outcome_compositions += 1
 
-    # Add a summary after the table showing how many compositions were filtered
-    lines.append(
-        f"\n**Note:** Showing {multiple_outcome_compositions} of {total_compositions} compositions. {total_compositions - multiple_outcome_compositions} compositions with only one outcome were filtered out."
-    )
+                outcomes = ", ".join(
+                    f"{r3} ({format_percentage(pct)}%)" for r3, pct in outcome_items
+                )
+
+                fraction_cell = ", ".join(
+                    percentage_to_fraction(pct) for _, pct in outcome_items
+                )
+
+                w(
+                    f"\n| {r1} | {r2} | {format_int(total)} | {outcomes} | {fraction_cell} |"
+                )
+
+        # Add a summary after the table showing how many compositions were filtered
+        w(
+            f"\n\n**Note:** Showing {multiple_outcome_compositions} of {total_compositions} compositions. {total_compositions - multiple_outcome_compositions} compositions with only one outcome were filtered out."
+        )
 
-    output_path.write_text("\n".join(lines), encoding="utf-8")
     print(f"Composition report saved as: {output_path.name}")
 
 
@@ -1,113 +1,111 @@
 import argparse
 import json
-import math
-import random
 import time
-from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
 from tqdm import tqdm
 
-from constants import ALLEN_RELATIONS
-from simulations import updateState, arCode
+from _simcc import N_RELATIONS
+from constants import ALLEN_RELATIONS, REL_INDEX
+
+# Prefer the ahead-of-time build (python _simcc.py), else JIT on first call
+try:
+    from allen_sim import simulate_triples
+except ImportError:
+    from _simcc import simulate_triples
 
 DEFAULT_TRIALS = 1000000
 DEFAULT_P_BORN = 0.5
 DEFAULT_P_DIE = 0.5
 DEFAULT_OUTPUT_FILE = "comp_results.json"
+PROGRESS_CHUNK = 1 << 16
 
 
 class InfEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, float) and not math.isfinite():
-            return "Infinity" if obj > 0 else "-Infinity"
-        elif isinstance(obj, timedelta):
+        if isinstance(obj, timedelta):
             return str(obj)
         return super().default(obj)
 
 
-def project(history, i, j):
-    out = [pair := [history[0][i], history[0][j]]]
-    for state in history[1:]:
-        curr = [state[i], state[j]]
-        if curr != pair:
-            out.append(curr)
-            pair = curr
-    return out
-
-
-def generate_valid_triples(p_born, p_die, trials, limit=None, quiet=False):
+def generate_valid_triples(p_born, p_die, trials, limit=None, quiet=False, seed=None):
     if not 0 <= p_born <= 1 or not 0 <= p_die <= 1:
         raise ValueError(
             f"Probabilities must be in [0, 1] range: pBorn={p_born}, pDie={p_die}"
         )
+    if p_born == 0 or p_die == 0:
+        raise ValueError(
+            f"No interval can end with pBorn={p_born}, pDie={p_die}; both must be positive"
+        )
 
-    runs = []
-    max_runs = limit or trials
-    pbar = tqdm(total=max_runs, disable=quiet, desc="Simulating")
-
-    for _ in range(trials):
-        if len(runs) >= max_runs:
-            break
+    # Every trial yields a valid triple, so `limit` runs need at most `limit` trials
+    max_runs = min(limit or trials, trials)
+    if max_runs <= 0:
+        raise RuntimeError(f"No valid triples were generated after {trials} attempts.")
 
-        hist = [[0, 0, 0]]
-        while hist[-1] != [2, 2, 2]:
-            last = hist[-1]
-            next_state = [updateState(last[i], p_born, p_die) for i in range(3)]
-            if next_state != last:
-                hist.append(next_state)
+    codes = np.empty((max_runs, 3), dtype=np.int8)
+    with tqdm(
+        total=max_runs,
+        disable=quiet,
+        desc="Simulating",
+        mininterval=0.2,
+        smoothing=0.05,
+    ) as pbar:
+        # One progress update per kernel call; only the first call seeds
+        for lo in range(0, max_runs, PROGRESS_CHUNK):
+            n = min(PROGRESS_CHUNK, max_runs - lo)
+            chunk_seed = seed if lo == 0 and seed is not None else -1
+            simulate_triples(p_born, p_die, codes[lo : lo + n], chunk_seed)
+            pbar.update(n)
+
+    # (r12, r23, r13) rows as ALLEN_RELATIONS ordinals
+    return codes
 
-        r12 = arCode(project(hist, 0, 1))
-        r23 = arCode(project(hist, 1, 2))
-        r13 = arCode(project(hist, 0, 2))
 
-        if None not in (r12, r23, r13):
-            runs.append((r12, r23, r13))
-            pbar.update(1)
+def build_composition_table(runs):
+    # Dense (r1, r2, r3) tally indexed by ALLEN_RELATIONS ordinal, taken a
+    # chunk at a time so the int64 cell codes stay bounded for long runs
+    counts = np.zeros(N_RELATIONS**3, dtype=np.int64)
+    for lo in range(0, len(runs), PROGRESS_CHUNK):
+        chunk = runs[lo : lo + PROGRESS_CHUNK]
+        flat = (chunk[:, 0].astype(np.int64) * N_RELATIONS + chunk[:, 1]) * N_RELATIONS
+        flat += chunk[:, 2]
+        counts += np.bincount(flat, minlength=N_RELATIONS**3)
+    return counts.reshape(N_RELATIONS, N_RELATIONS, N_RELATIONS)
 
-    pbar.close()
 
-    if not runs:
-        raise RuntimeError(f"No valid triples were generated after {trials} attempts.")
+def composition_counts(table, r1, r2):
+    cell = table[REL_INDEX[r1], REL_INDEX[r2]]
+    return {ALLEN_RELATIONS[k]: int(cell[k]) for k in np.flatnonzero(cell)}
 
-    return runs
 
+def summarise_compositions(table, p_born, p_die, trials, metadata):
+    totals = table.sum(axis=2)
+    percentages = (
+        np.divide(
+            table,
+            totals[:, :, None],
+            out=np.zeros(table.shape),
+            where=totals[:, :, None] > 0,
+        )
+        * 100
+    )
 
-def build_composition_table(runs):
-    table = {
-        r1: {r2: defaultdict(int) for r2 in ALLEN_RELATIONS} for r1 in ALLEN_RELATIONS
+    compositions = {
+        r1: {r2: "unobserved" for r2 in ALLEN_RELATIONS} for r1 in ALLEN_RELATIONS
     }
-    for r1, r2, r3 in runs:
-        table[r1][r2][r3] += 1
-    return table
-
+    for i, j in zip(*np.nonzero(totals)):
+        compositions[ALLEN_RELATIONS[i]][ALLEN_RELATIONS[j]] = {
+            ALLEN_RELATIONS[k]: {
+                "count": int(table[i, j, k]),
+                "percentage": round(float(percentages[i, j, k]), 2),
+            }
+            for k in np.flatnonzero(table[i, j])
+        }
 
-def summarise_compositions(table, p_born, p_die, trials, metadata):
-    compositions = {}
-    for r1 in table:
-        compositions[r1] = {}
-        for r2 in table[r1]:
-            counts = table[r1][r2]
-            total = sum(counts.values())
-            if total == 0:
-                compositions[r1][r2] = "unobserved"
-            else:
-                compositions[r1][r2] = {
-                    r3: {
-                        "count": counts[r3],
-                        "percentage": round((counts[r3] / total) * 100, 2),
-                    }
-                    for r3 in counts
-                    if counts[r3] > 0
-                }
-
-    coverage = sum(
-        1
-        for r1 in compositions
-        for r2 in compositions[r1]
-        if compositions[r1][r2] != "unobserved"
-    )
+    coverage = int((totals > 0).sum())
 
     return {
         "pBorn": p_born,
@@ -122,10 +120,8 @@ def summarise_compositions(table, p_born, p_die, trials, metadata):
 
 
 def run(p_born, p_die, trials, limit=None, quiet=False, seed=None):
-    if seed is not None:
-        random.seed(seed)
-        if not quiet:
-            print(f"Using random seed: {seed}")
+    if seed is not None and not quiet:
+        print(f"Using random seed: {seed}")
 
     start = time.time()
     timestamp = datetime.now().isoformat(timespec="seconds")
@@ -136,7 +132,7 @@ def run(p_born, p_die, trials, limit=None, quiet=False, seed=None):
             + (f" (limited to {limit} valid runs)" if limit else "")
         )
 
-    runs = generate_valid_triples(p_born, p_die, trials, limit, quiet)
+    runs = generate_valid_triples(p_born, p_die, trials, limit, quiet, seed)
 
     table = build_composition_table(runs)
     duration = timedelta(seconds=int(time.time() - start))
@@ -167,8 +163,8 @@ def main():
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with out_path.open("w") as f:
-        json.dump(stats, f, indent=2, cls=InfEncoder, sort_keys=True)
+    with out_path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        json.dump(stats, f, indent=2, cls=InfEncoder)
 
     if not args.quiet:
         total_entries = sum(
@@ -1,3 +1,10 @@
+import math
+from array import array
+from enum import IntEnum
+from types import MappingProxyType
+
+import numpy as np
+
 # Allen relation symbols
 BEFORE = "p"
 MEETS = "m"
@@ -13,7 +20,8 @@ OVERLAPPED_BY = "O"
 MET_BY = "M"
 AFTER = "P"
 
-ALLEN_RELATIONS = [
+# A tuple, so every table keyed or ordered by relation shares one fixed order
+ALLEN_RELATIONS = (
     BEFORE,
     MEETS,
     OVERLAPS,
@@ -27,87 +35,138 @@ ALLEN_RELATIONS = [
     OVERLAPPED_BY,
     MET_BY,
     AFTER,
-]
-
-# English names for Allen relations
-RELATION_NAMES = {
-    "p": "Before",
-    "m": "Meets",
-    "o": "Overlaps",
-    "F": "Finished By",
-    "D": "Contains",
-    "s": "Starts",
-    "e": "Equals",
-    "S": "Started By",
-    "d": "During",
-    "f": "Finishes",
-    "O": "Overlapped By",
-    "M": "Met By",
-    "P": "After",
-}
+)
+
+# Position of each relation in ALLEN_RELATIONS, for int-coded counts
+REL_INDEX = {rel: i for i, rel in enumerate(ALLEN_RELATIONS)}
+
+# One bit per relation, in ALLEN_RELATIONS order, so relation sets are ints
+REL_BIT = {rel: 1 << i for i, rel in enumerate(ALLEN_RELATIONS)}
+ALL_RELATIONS_MASK = (1 << len(ALLEN_RELATIONS)) - 1
+
+# Converse of each relation, by ordinal and by symbol. ALLEN_RELATIONS lists
+# each relation opposite its converse (p/P, m/M, ..., e in the middle)
+RELATION_CONVERSE_TABLE = ALLEN_RELATIONS[::-1]
+RELATION_CONVERSES = MappingProxyType(
+    dict(zip(ALLEN_RELATIONS, RELATION_CONVERSE_TABLE))
+)
+
+# Converse of every relation set, CONVERSE_TABLE[bits]: the bitmask reversed,
+# built here from the mask without its low bit
+CONVERSE_TABLE = array("H", bytes(2 * (ALL_RELATIONS_MASK + 1)))
+for _bits in range(1, ALL_RELATIONS_MASK + 1):
+    CONVERSE_TABLE[_bits] = (CONVERSE_TABLE[_bits >> 1] >> 1) | (
+        (_bits & 1) << (len(ALLEN_RELATIONS) - 1)
+    )
+
+# English names, indexed by relation ordinal
+RELATION_NAME_TABLE = (
+    "Before",
+    "Meets",
+    "Overlaps",
+    "Finished By",
+    "Contains",
+    "Starts",
+    "Equals",
+    "Started By",
+    "During",
+    "Finishes",
+    "Overlapped By",
+    "Met By",
+    "After",
+)
+
+# The same, keyed by relation symbol
+RELATION_NAMES = MappingProxyType(dict(zip(ALLEN_RELATIONS, RELATION_NAME_TABLE)))
+
+
+def __getattr__(name):
+    # Plot colors (RELATION_COLOR_TABLE, RELATION_COLORS) are only used by the
+    # dashboard, so constants_colors is imported on first access rather than
+    # by every simulation run
+    if name in ("RELATION_COLOR_TABLE", "RELATION_COLORS"):
+        import constants_colors
+
+        globals()[name] = getattr(constants_colors, name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Relation colors for visualization
-RELATION_COLORS = {
-    "p": "#1f77b4",  # Blue
-    "m": "#ff7f0e",  # Orange
-    "o": "#2ca02c",  # Green
-    "F": "#d62728",  # Red
-    "D": "#9467bd",  # Purple
-    "s": "#8c564b",  # Brown
-    "e": "#e377c2",  # Pink
-    "S": "#7f7f7f",  # Gray
-    "d": "#bcbd22",  # Yellow-green
-    "f": "#17becf",  # Cyan
-    "O": "#aec7e8",  # Light blue
-    "M": "#ffbb78",  # Light orange
-    "P": "#98df8a",  # Light green
-}
 
 # Interval states
-UNBORN = 0
-ALIVE = 1
-DEAD = 2
-
-# Theoretical distributions
-UNIFORM_DISTRIBUTION = {rel: 1 / 13 for rel in ALLEN_RELATIONS}
-
-FERNANDO_VOGEL_DISTRIBUTION = {
-    "p": 1 / 6,
-    "m": 0,
-    "o": 1 / 6,
-    "F": 0,
-    "D": 1 / 6,
-    "s": 0,
-    "e": 0,
-    "S": 0,
-    "d": 1 / 6,
-    "f": 0,
-    "O": 1 / 6,
-    "M": 0,
-    "P": 1 / 6,
-}
+class IntervalState(IntEnum):
+    UNBORN = 0
+    ALIVE = 1
+    DEAD = 2
+
+
+# Plain int aliases: simulation loops compare states per step, and enum
+# members compare slower than plain ints
+UNBORN, ALIVE, DEAD = map(int, IntervalState)
 
-SULIMAN_DISTRIBUTION = {
-    "p": 1 / 9,
-    "m": 1 / 9,
-    "o": 1 / 27,
-    "F": 1 / 27,
-    "D": 1 / 27,
-    "s": 1 / 9,
-    "e": 1 / 9,
-    "S": 1 / 9,
-    "d": 1 / 27,
-    "f": 1 / 27,
-    "O": 1 / 27,
-    "M": 1 / 9,
-    "P": 1 / 9,
+# Theoretical distributions, read-only
+UNIFORM_DISTRIBUTION = MappingProxyType(dict.fromkeys(ALLEN_RELATIONS, 1 / 13))
+
+
+def reciprocals(denominators):
+    # Read-only distribution from one denominator per relation, in
+    # ALLEN_RELATIONS order; 0 marks a relation with no weight
+    return MappingProxyType(
+        {
+            rel: 1 / int(d) if int(d) else 0
+            for rel, d in zip(ALLEN_RELATIONS, denominators.split())
+        }
+    )
+
+
+# Weights listed as denominators, in the order p m o F D s e S d f O M P
+FERNANDO_VOGEL_DISTRIBUTION = reciprocals("6  0  6  0  6  0  0  0  6  0  6  0  6")
+SULIMAN_DISTRIBUTION = reciprocals("9  9  27 27 27 9  9  9  27 27 27 9  9")
+
+# Each distribution's total, checked once at import so a mistyped weight
+# fails loudly; fsum keeps the 1/27 terms from drifting
+DISTRIBUTION_SUMS = {
+    "UNIFORM": math.fsum(UNIFORM_DISTRIBUTION.values()),
+    "FERNANDO_VOGEL": math.fsum(FERNANDO_VOGEL_DISTRIBUTION.values()),
+    "SULIMAN": math.fsum(SULIMAN_DISTRIBUTION.values()),
 }
+for _name, _total in DISTRIBUTION_SUMS.items():
+    if not math.isclose(_total, 1.0, abs_tol=1e-9):
+        raise ValueError(f"{_name} distribution sums to {_total}, not 1")
+
+
+def distribution_pmf(dist):
+    # Probabilities in ALLEN_RELATIONS order, as a read-only array
+    pmf = np.array([dist.get(rel, 0) for rel in ALLEN_RELATIONS], dtype=np.float64)
+    pmf.flags.writeable = False
+    return pmf
+
+
+UNIFORM_PMF = distribution_pmf(UNIFORM_DISTRIBUTION)
+FERNANDO_VOGEL_PMF = distribution_pmf(FERNANDO_VOGEL_DISTRIBUTION)
+SULIMAN_PMF = distribution_pmf(SULIMAN_DISTRIBUTION)
+
+
+def distribution_cdf(pmf):
+    # Running totals of a PMF, the last pinned to exactly 1 so every uniform
+    # draw in [0, 1) falls inside
+    cdf = np.cumsum(pmf)
+    cdf[-1] = 1.0
+    cdf.flags.writeable = False
+    return cdf
+
+
+UNIFORM_CDF = distribution_cdf(UNIFORM_PMF)
+FERNANDO_VOGEL_CDF = distribution_cdf(FERNANDO_VOGEL_PMF)
+SULIMAN_CDF = distribution_cdf(SULIMAN_PMF)
+
+
+def sample_relations(cdf, n, rng):
+    # n relation ordinals drawn from a distribution, e.g. SULIMAN_CDF, in one
+    # binary search; side="right" never lands on a zero-probability relation
+    return np.searchsorted(cdf, rng.random(n), side="right")
+
 
 # Quick sanity check for distribution sums
 if __name__ == "__main__":
-    for name, dist in {
-        "UNIFORM": UNIFORM_DISTRIBUTION,
-        "FERNANDO_VOGEL": FERNANDO_VOGEL_DISTRIBUTION,
-        "SULIMAN": SULIMAN_DISTRIBUTION,
-    }.items():
-        print(f"{name} sum: {sum(dist.values()):.6f}")
+    for name, total in DISTRIBUTION_SUMS.items():
+        print(f"{name} sum: {total:.6f}")
@@ -0,0 +1,23 @@
+from types import MappingProxyType
+
+from constants import ALLEN_RELATIONS
+
+# Relation colors for visualization, indexed by relation ordinal
+RELATION_COLOR_TABLE = (
+    "#1f77b4",  # Blue
+    "#ff7f0e",  # Orange
+    "#2ca02c",  # Green
+    "#d62728",  # Red
+    "#9467bd",  # Purple
+    "#8c564b",  # Brown
+    "#e377c2",  # Pink
+    "#7f7f7f",  # Gray
+    "#bcbd22",  # Yellow-green
+    "#17becf",  # Cyan
+    "#aec7e8",  # Light blue
+    "#ffbb78",  # Light orange
+    "#98df8a",  # Light green
+)
+
+# The same, keyed by relation symbol
+RELATION_COLORS = MappingProxyType(dict(zip(ALLEN_RELATIONS, RELATION_COLOR_TABLE)))
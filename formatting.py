@@ -0,0 +1,17 @@
+import math
+
+_FMT4 = "{:.4f}".format
+
+
+def format_number(val, digits=4):
+    if val is None:
+        return "N/A"
+    if isinstance(val, float):
+        if val != val:
+            return "NaN"
+        if val == math.inf:
+            return "∞"
+        if val == -math.inf:
+            return "-∞"
+        return _FMT4(val) if digits == 4 else f"{val:.{digits}f}"
+    return str(val)
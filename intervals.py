@@ -1,5 +1,6 @@
 from random import random as rand
 import constants as c
+from _simcc import pair_counts
 
 
 def get_relation(a_start, a_end, b_start, b_end):
@@ -52,18 +53,15 @@ def gen_relation(p1, q1, p2, q2, t=0):
     return get_relation(a_start, a_end, b_start, b_end)
 
 
+# Tallies run in the compiled kernel; gen and get_relation remain the
+# step-by-step reference
 def many(p, q, n=1000):
-    counts = {rel: 0 for rel in c.ALLEN_RELATIONS}
-    for _ in range(n):
-        counts[run(p, q)] += 1
-    return counts
+    return simulate_relations(p, q, p, q, n)
 
 
 def simulate_relations(p1, q1, p2, q2, trials=1000):
-    counts = {rel: 0 for rel in c.ALLEN_RELATIONS}
-    for _ in range(trials):
-        counts[gen_relation(p1, q1, p2, q2)] += 1
-    return counts
+    counts = pair_counts(p1, q1, p2, q2, trials, -1)
+    return dict(zip(c.ALLEN_RELATIONS, counts.tolist()))
 
 
 if __name__ == "__main__":
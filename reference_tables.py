@@ -1,9 +1,13 @@
+from functools import lru_cache
+
 from dash import html
 
 
+@lru_cache(maxsize=1)
 def get_reference_tables():
     """
     Returns the HTML structure for the Allen interval composition reference tables.
+    The tables take no inputs, so the tree is built once and shared by every caller.
     """
     return html.Div(
         [
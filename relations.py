@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import constants as c
 
 
@@ -9,6 +11,24 @@ def r(x):
     return f"r{x}"
 
 
+def rel_mask(rels):
+    # Relation set as a bitmask over ALLEN_RELATIONS
+    bits = 0
+    for rel in rels:
+        bits |= c.REL_BIT[rel]
+    return bits
+
+
+def mask_rels(bits):
+    # Relations in a bitmask, in ALLEN_RELATIONS order
+    rels = []
+    while bits:
+        low = bits & -bits
+        rels.append(c.ALLEN_RELATIONS[low.bit_length() - 1])
+        bits ^= low
+    return rels
+
+
 def voc(seq):
     return set().union(*seq) if seq else set()
 
@@ -86,7 +106,9 @@ def allInv(string, x, y):
     return "?"
 
 
-def tt(r1, r2):
+# The composition table is static, so each of its 169 cells is derived once
+@lru_cache(maxsize=None)
+def _tt(r1, r2):
     s1, s2 = allen(0, 1, r1), allen(1, 2, r2)
     results = []
     for merged in super(s1, s2):
@@ -94,7 +116,48 @@ def tt(r1, r2):
         rel = allInv(proj_02, 0, 2)
         if rel not in results:
             results.append(rel)
-    return results
+    return tuple(results)
+
+
+def tt(r1, r2):
+    return list(_tt(r1, r2))
+
+
+# composition_table()[i][j] is the bitmask of relations 0 can bear to 2 when
+# 0 is in relation ALLEN_RELATIONS[i] to 1 and 1 in ALLEN_RELATIONS[j] to 2.
+# Deriving it runs all 169 superpositions, so it is built on first use, not
+# on import by the dashboard, which only needs rel_mask and mask_rels
+@lru_cache(maxsize=1)
+def composition_table():
+    return tuple(
+        tuple(rel_mask(_tt(r1, r2)) for r2 in c.ALLEN_RELATIONS)
+        for r1 in c.ALLEN_RELATIONS
+    )
+
+
+def __getattr__(name):
+    # COMPOSITION_TABLE stays available as a module constant
+    if name == "COMPOSITION_TABLE":
+        return composition_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1 << 14)
+def compose_sets(mask1, mask2):
+    # Composition of two relation sets, as the union of their single
+    # compositions; relation sets are bitmasks as in rel_mask
+    table = composition_table()
+    result = 0
+    while mask1:
+        low1 = mask1 & -mask1
+        row = table[low1.bit_length() - 1]
+        rest = mask2
+        while rest:
+            low2 = rest & -rest
+            result |= row[low2.bit_length() - 1]
+            rest ^= low2
+        mask1 ^= low1
+    return result
 
 
 def show(r1, r2):
@@ -108,4 +171,8 @@ def show(r1, r2):
 
 if __name__ == "__main__":
     print("Example: tt('p', 'd') =", tt("p", "d"))
+    print(
+        "Example: compose_sets({p, m}, {d}) =",
+        mask_rels(compose_sets(rel_mask("pm"), rel_mask("d"))),
+    )
     show("p", "d")
@@ -1,25 +1,20 @@
-import sys, json, math
+import sys, json
 from pathlib import Path
+from formatting import format_number
 
 DEFAULT_INPUT, DEFAULT_OUTPUT = "sim_results.json", "SIM_RESULTS.md"
 
 
-def format_number(val, digits=4):
-    if val is None:
-        return "N/A"
-    if isinstance(val, float):
-        if math.isnan(val):
-            return "NaN"
-        if math.isinf(val):
-            return "∞" if val > 0 else "-∞"
-        return f"{val:.{digits}f}"
-    return str(val)
-
-
 def generate_simulation_report(data, output_path):
-    meta, results = data.get("metadata", {}), data.get("results", {})
-
-    lines = [
+    meta = data.get("metadata", {})
+    if "entries" in data:
+        entries = sorted(data["entries"], key=lambda e: (e.get("i", 0), e.get("j", 0)))
+    else:
+        # Legacy files keyed results by f"{p:.6f}_{q:.6f}"
+        results = data.get("results", {})
+        entries = [results[key] for key in sorted(results.keys())]
+
+    header = [
         "# Simulation Results",
         f"- **Generated:** `{meta.get('timestamp', 'N/A').replace('T', ' ')}`",
         f"- **Duration:** `{meta.get('duration', 'N/A')}`",
@@ -30,27 +25,29 @@ def generate_simulation_report(data, output_path):
         "|---|---|---------|------|--------|----------|------|----------|--------------|--------------|----------------|",
     ]
 
-    for key in sorted(results.keys()):
-        entry = results[key]
-        p, q = entry.get("p", 0), entry.get("q", 0)
-        stats = entry.get("stats", {})
-        summary = stats.get("summary", {})
-        compare = stats.get("compare", {})
-
-        lines.append(
-            f"| {p:.3f} | {q:.3f} "
-            f"| {format_number(summary.get('entropy'))} "
-            f"| {format_number(summary.get('gini'))} "
-            f"| {format_number(summary.get('stddev'))} "
-            f"| {summary.get('coverage', 'N/A')} "
-            f"| {summary.get('mode', 'N/A')} "
-            f"| {stats.get('best_fit', 'N/A')} "
-            f"| {format_number(compare.get('Uniform', {}).get('js'))} "
-            f"| {format_number(compare.get('Suliman', {}).get('js'))} "
-            f"| {format_number(compare.get('F-V', {}).get('js'))} |"
-        )
+    with output_path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        w = f.write
+        w("\n".join(header))
+
+        for entry in entries:
+            p, q = entry.get("p", 0), entry.get("q", 0)
+            stats = entry.get("stats", {})
+            summary = stats.get("summary", {})
+            compare = stats.get("compare", {})
+
+            w(
+                f"\n| {p:.3f} | {q:.3f} "
+                f"| {format_number(summary.get('entropy'))} "
+                f"| {format_number(summary.get('gini'))} "
+                f"| {format_number(summary.get('stddev'))} "
+                f"| {summary.get('coverage', 'N/A')} "
+                f"| {summary.get('mode', 'N/A')} "
+                f"| {stats.get('best_fit', 'N/A')} "
+                f"| {format_number(compare.get('Uniform', {}).get('js'))} "
+                f"| {format_number(compare.get('Suliman', {}).get('js'))} "
+                f"| {format_number(compare.get('F-V', {}).get('js'))} |"
+            )
 
-    output_path.write_text("\n".join(lines), encoding="utf-8")
     print(f"Simulation report saved as: {output_path.name}")
 
 
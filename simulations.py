@@ -1,8 +1,15 @@
 from random import random as rand
+import numpy as np
 import constants as c
 import stats
 
-# Track global tallies by (pBorn, pDie)
+# Prefer the ahead-of-time build (python _simcc.py), else JIT on first call
+try:
+    from allen_sim import ar_simulate_batch
+except ImportError:
+    from _simcc import ar_simulate_batch
+
+# Track global tallies by (pBorn, pDie), as rows ordered like ALLEN_RELATIONS
 tally = {}
 
 
@@ -11,6 +18,8 @@ def allen_relation_order():
 
 
 def updateState(state, pBorn, pDie):
+    if state == c.DEAD:
+        return state
     toss = rand()
     if state == c.UNBORN and toss < pBorn:
         return c.ALIVE
@@ -19,9 +28,19 @@ def updateState(state, pBorn, pDie):
     return state
 
 
+def pack_history(hist):
+    # One base-10 digit per (a, b) state, offset by one so that histories of
+    # different lengths can never share a code
+    code = 0
+    for a, b in hist:
+        code = code * 10 + a * 3 + b + 1
+    return code
+
+
 # Allen relation codes from transition histories
-def arCode(hist):
-    rel_map = {
+AR_CODES = {
+    pack_history(hist): rel
+    for hist, rel in {
         ((0, 0), (1, 1), (2, 2)): "e",
         ((0, 0), (1, 0), (2, 0), (2, 1), (2, 2)): "p",
         ((0, 0), (0, 1), (0, 2), (1, 2), (2, 2)): "P",
@@ -35,8 +54,12 @@ def arCode(hist):
         ((0, 0), (1, 1), (1, 2), (2, 2)): "S",
         ((0, 0), (0, 1), (1, 1), (2, 2)): "f",
         ((0, 0), (1, 0), (1, 1), (2, 2)): "F",
-    }
-    return rel_map.get(tuple(map(tuple, hist)), "unknown")
+    }.items()
+}
+
+
+def arCode(hist):
+    return AR_CODES.get(pack_history(hist), "unknown")
 
 
 def arInitDic():
@@ -44,13 +67,15 @@ def arInitDic():
 
 
 def simulateRun(pBorn, pDie):
-    hist = [[0, 0]]
-    while hist[-1] != [2, 2]:
-        a, b = hist[-1]
-        next_a = updateState(a, pBorn, pDie)
-        next_b = updateState(b, pBorn, pDie)
-        if [next_a, next_b] != hist[-1]:
-            hist.append([next_a, next_b])
+    hist = [(0, 0)]
+    while hist[-1] != (2, 2):
+        last = hist[-1]
+        next_state = (
+            updateState(last[0], pBorn, pDie),
+            updateState(last[1], pBorn, pDie),
+        )
+        if next_state != last:
+            hist.append(next_state)
     return hist
 
 
@@ -67,26 +92,29 @@ def scoreRed(histories):
     return counts
 
 
-def updateTally(pBorn, pDie, dic):
+def updateTally(pBorn, pDie, counts):
+    # counts is a relation dict or a row ordered as allen_relation_order()
     key = f"{pBorn},{pDie}"
+    if isinstance(counts, dict):
+        counts = [counts.get(rel, 0) for rel in allen_relation_order()]
     if key not in tally:
-        tally[key] = arInitDic()
-    for rel in dic:
-        tally[key][rel] += dic[rel]
+        tally[key] = np.zeros(len(allen_relation_order()), dtype=np.int64)
+    tally[key] += counts
 
 
 def arSimulate(pBorn, pDie, trials):
-    runs = simulateRed(pBorn, pDie, trials)
-    counts = scoreRed(runs)
-    updateTally(pBorn, pDie, counts)
-    return counts
+    # All uniforms for the run are drawn in one block by the batch kernel;
+    # simulateRed/scoreRed remain the step-by-step reference version
+    row = ar_simulate_batch(np.array([pBorn]), np.array([pDie]), trials, -1)[0]
+    updateTally(pBorn, pDie, row)
+    return dict(zip(allen_relation_order(), row.tolist()))
 
 
 # Optional: dump tally to a file
 def dump_tally(file_path):
     with open(file_path, "w") as f:
         for k in tally:
-            f.write(f"{k}: {tally[k]}\n")
+            f.write(f"{k}: {dict(zip(allen_relation_order(), tally[k].tolist()))}\n")
 
 
 # Demo for sanity checking
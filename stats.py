@@ -55,6 +55,16 @@ def chi_square_uniform(counts):
     return p
 
 
+def expected_pmf(expected):
+    # Reference probabilities in ALLEN_RELATIONS order, e.g. c.UNIFORM_PMF;
+    # dicts keyed by relation are converted and None means uniform
+    if expected is None:
+        return c.UNIFORM_PMF
+    if isinstance(expected, np.ndarray):
+        return expected
+    return c.distribution_pmf(expected)
+
+
 def chi_square_against_theory(observed, expected_probs):
     total = sum(observed.values())
     if total == 0:
@@ -63,9 +73,10 @@ def chi_square_against_theory(observed, expected_probs):
     obs = []
     expected = []
 
-    for rel in c.ALLEN_RELATIONS:
+    pmf = expected_pmf(expected_probs).tolist()
+    for rel, prob in zip(c.ALLEN_RELATIONS, pmf):
         o = observed.get(rel, 0)
-        e = expected_probs.get(rel, 0) * total
+        e = prob * total
         if e > 0:
             obs.append(o)
             expected.append(e)
@@ -86,7 +97,7 @@ def kl_divergence(observed, expected_dict):
     if total == 0:
         return 0.0
     obs = [max(observed.get(rel, 0) / total, 1e-10) for rel in c.ALLEN_RELATIONS]
-    exp = [max(expected_dict.get(rel, 0), 1e-10) for rel in c.ALLEN_RELATIONS]
+    exp = np.maximum(expected_pmf(expected_dict), 1e-10)
     return float(stats.entropy(obs, exp))
 
 
@@ -95,7 +106,7 @@ def js_divergence(observed, expected_dict):
     if total == 0:
         return 0.0
     obs = np.array([observed.get(rel, 0) / total for rel in c.ALLEN_RELATIONS])
-    exp = np.array([expected_dict.get(rel, 0) for rel in c.ALLEN_RELATIONS])
+    exp = expected_pmf(expected_dict)
     epsilon = 1e-10
     obs = np.clip(obs, epsilon, 1)
     exp = np.clip(exp, epsilon, 1)
@@ -114,25 +125,67 @@ def describe_global(counts, expected_dict=None, smooth=False):
         "stddev": stddev(counts),
         "chi_square_uniform": chi_square_uniform(counts),
         "chi_square_theory": (
-            chi_square_against_theory(counts, expected_dict) if expected_dict else None
+            chi_square_against_theory(counts, expected_dict)
+            if expected_dict is not None
+            else None
         ),
         "kl_divergence": (
-            kl_divergence(counts, expected_dict) if expected_dict else None
+            kl_divergence(counts, expected_dict) if expected_dict is not None else None
         ),
         "js_divergence": (
-            js_divergence(counts, expected_dict) if expected_dict else None
+            js_divergence(counts, expected_dict) if expected_dict is not None else None
         ),
         "total_count": sum(counts.values()),
     }
 
 
+def describe_global_multi(counts, refs, smooth=()):
+    """
+    Describe one set of counts against several reference distributions.
+
+    Reference-independent metrics are computed once; `compare` holds the
+    per-reference chi-square, KL and JS values. A reference may be a PMF
+    array, a relation-keyed dict, or None for the uniform distribution.
+    References named in `smooth` are compared against Laplace-smoothed
+    counts, as `describe_global` does.
+    """
+    smoothed = apply_laplace_smoothing(counts) if smooth else None
+
+    compare = {}
+    for name, expected in refs.items():
+        observed = smoothed if name in smooth else counts
+        compare[name] = {
+            "chi_square_theory": chi_square_against_theory(observed, expected),
+            "kl_divergence": kl_divergence(observed, expected),
+            "js_divergence": js_divergence(observed, expected),
+        }
+
+    return {
+        "entropy": entropy(counts),
+        "gini": gini(counts),
+        "coverage": coverage(counts),
+        "mode": mode_relation(counts),
+        "stddev": stddev(counts),
+        "chi_square_uniform": chi_square_uniform(counts),
+        "total_count": sum(counts.values()),
+        "compare": compare,
+    }
+
+
 # ===============================================
 # COMPOSITION TABLE CELL STATISTICS
 # ===============================================
 
 
+# Maximum entropy log2(k) for each support size k a relation count can have
+LOG2_SUPPORT = [0.0] + [math.log2(k) for k in range(1, len(c.ALLEN_RELATIONS) + 1)]
+
+
 def normalized_entropy(counts):
-    max_entropy = math.log2(len([v for v in counts.values() if v > 0]) or 1)
+    support = sum(1 for v in counts.values() if v > 0)
+    max_entropy = (
+        LOG2_SUPPORT[support] if support < len(LOG2_SUPPORT) else math.log2(support)
+    )
     return entropy(counts) / max_entropy if max_entropy > 0 else 0.0
 
 
@@ -140,6 +193,14 @@ def top_k(counts, k=3):
     return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:k]
 
 
+def entropy_matrix(counts):
+    # Shannon entropy along the last axis of a dense count array
+    totals = counts.sum(axis=-1, keepdims=True)
+    probs = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    logs = np.log2(probs, out=np.zeros(probs.shape), where=probs > 0)
+    return -(probs * logs).sum(axis=-1)
+
+
 def describe_cell(counts):
     return {
         "entropy": entropy(counts),
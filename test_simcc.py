@@ -0,0 +1,47 @@
+import os
+
+# workqueue is the threading layer where a parallel np.random draw goes
+# through per-thread states; set before numba starts its thread pool
+os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")
+
+import numpy as np
+import pytest
+
+import _simcc
+
+
+def test_simulate_triples_same_seed_same_rows():
+    first = np.empty((100000, 3), dtype=np.int8)
+    second = np.empty_like(first)
+    _simcc.simulate_triples(0.2, 0.1, first, 7)
+    _simcc.simulate_triples(0.2, 0.1, second, 7)
+    assert np.array_equal(first, second)
+
+
+def test_pair_counts_same_seed_same_tally():
+    first = _simcc.pair_counts(0.2, 0.1, 0.2, 0.1, 200000, 7)
+    second = _simcc.pair_counts(0.2, 0.1, 0.2, 0.1, 200000, 7)
+    assert np.array_equal(first, second)
+
+
+def test_ar_simulate_batch_same_seed_same_counts():
+    p = np.array([0.2, 0.5])
+    q = np.array([0.1, 0.3])
+    first = _simcc.ar_simulate_batch(p, q, 50000, 7)
+    assert np.array_equal(first, _simcc.ar_simulate_batch(p, q, 50000, 7))
+
+
+def test_aot_build_matches_jit():
+    # Only when the extension has been built with python _simcc.py
+    allen_sim = pytest.importorskip("allen_sim")
+    jit_rows = np.empty((100000, 3), dtype=np.int8)
+    aot_rows = np.empty_like(jit_rows)
+    _simcc.simulate_triples(0.2, 0.1, jit_rows, 7)
+    allen_sim.simulate_triples(0.2, 0.1, aot_rows, 7)
+    assert np.array_equal(jit_rows, aot_rows)
+    p = np.array([0.2, 0.5])
+    q = np.array([0.1, 0.3])
+    assert np.array_equal(
+        _simcc.ar_simulate_batch(p, q, 50000, 7),
+        allen_sim.ar_simulate_batch(p, q, 50000, 7),
+    )